@@ -1,20 +1,138 @@
+import struct
+import sys
+import time
+
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+
+from memorymaze.cache import PathCache
+from memorymaze.change import Change
+from memorymaze.change import ChangeType
 from memorymaze.gamestate import GameState
+from memorymaze.gamestate import PATH_STRATEGY
 from memorymaze.grid import MemoryMazeGrid
+from memorymaze.grid import SEARCH_NODE_BUDGET
+from memorymaze.grid import SEARCH_TIME_LIMIT
+from memorymaze.grid import square_typecode
+from memorymaze.levelpack import LevelPack
+from memorymaze.result import NO_RESULT
 from memorymaze.result import SelectResult
+from memorymaze.seen import SeenPaths
+from memorymaze.strategy import PathStrategy
+
+# Version of the session snapshot format, see MemoryMaze.to_bytes().
+SNAPSHOT_VERSION = 1
+
+# Version, level, lives, flags, grid size and current index, followed by the
+# square indices of the path.
+_SNAPSHOT_HEADER = struct.Struct("<BIHBHI")
+
+_SNAPSHOT_LOCKED = 1
+_SNAPSHOT_HAS_PATH = 2
+
+# Worker thread generating the next level's path in the background, shared by
+# all games and started on first use.
+_prefetch_executor = None
+
+
+def _get_prefetch_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared executor for generating paths in the background,
+    creating it if needed.
+
+    Returns:
+        :class:`~ThreadPoolExecutor`
+    """
+
+    global _prefetch_executor
+    if _prefetch_executor is None:
+        _prefetch_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memorymaze-prefetch")
+    return _prefetch_executor
 
 
 class MemoryMaze:
     """
     Class handling the business logic for the MemoryMaze game.
+
+    Arguments:
+        strategy (:class:`~PathStrategy`): Strategy used to generate the path
+            for each level.
+        prefetch (bool): Whether to generate the next level's path on a
+            background thread as soon as a level begins, so completing a
+            level doesn't have to wait for it.
+        seed: Seed for generating paths, so that every game with the same
+            seed gets the same paths, for example for daily challenges or
+            replays. None for random paths.
+        cache (:class:`~PathCache`): Cache for paths generated from a seed.
+        level_pack (:class:`~LevelPack`): Precomputed paths to use for the
+            levels it has, instead of generating them. Levels past the end of
+            the pack, or whose sizes don't match the game state, are
+            generated as usual.
+        seen_paths (:class:`~SeenPaths`): Fingerprints of paths already
+            seen, so that generated paths don't repeat. None to allow
+            repeats.
+        game_state (:class:`~GameState`): Game state to play with, for
+            example one with different progression settings. None for a
+            default one.
     """
 
-    def __init__(self):
-        self._game_state = GameState()
-        self._grid = MemoryMazeGrid()
-        self._locked = False
+    __slots__ = ("_game_state", "_grid", "_level_pack", "_locked", "_prefetch_enabled", "_prefetch",
+        "_prefetch_level", "_subscribers")
 
+    def __init__(self, strategy: PathStrategy = PATH_STRATEGY, prefetch: bool = True, seed=None,
+            cache: PathCache | None = None, level_pack: LevelPack | None = None,
+            seen_paths: SeenPaths | None = None, game_state: GameState | None = None):
+        self._setup(strategy, prefetch, seed, cache, level_pack, seen_paths, game_state)
         self._generate_path()
     
+    @classmethod
+    def from_bytes(cls, data: bytes, strategy: PathStrategy = PATH_STRATEGY, prefetch: bool = True, seed=None,
+            cache: PathCache | None = None, level_pack: LevelPack | None = None,
+            seen_paths: SeenPaths | None = None, game_state: GameState | None = None):
+        """
+        Constructs a :class:`~MemoryMaze` object from a snapshot returned by
+        :meth:`to_bytes`, without generating a path. The remaining arguments
+        are the same as for the constructor, as they aren't part of the
+        snapshot.
+
+        Arguments:
+            data (bytes): The snapshot.
+
+        Returns:
+            MemoryMaze
+
+        Raises:
+            ValueError: If the snapshot is not valid.
+        """
+
+        if len(data) < _SNAPSHOT_HEADER.size:
+            raise ValueError("Snapshot is truncated")
+
+        version, level, lives, flags, grid_size, current_index = _SNAPSHOT_HEADER.unpack_from(data)
+
+        if version != SNAPSHOT_VERSION:
+            raise ValueError("Unsupported snapshot version")
+
+        squares = None
+        if flags & _SNAPSHOT_HAS_PATH:
+            squares = array(square_typecode(grid_size))
+            body = memoryview(data)[_SNAPSHOT_HEADER.size:]
+            if len(body) % squares.itemsize:
+                raise ValueError("Snapshot is truncated")
+            squares.frombytes(body)
+            if sys.byteorder != "little":
+                squares.byteswap()
+
+        memory_maze = cls.__new__(cls)
+        memory_maze._setup(strategy, prefetch, seed, cache, level_pack, seen_paths, game_state)
+        memory_maze._game_state.restore(level, lives)
+        if grid_size != memory_maze._game_state.grid_size_at(level):
+            raise ValueError("Grid size doesn't match the level")
+        memory_maze._grid.set_squares(squares, grid_size, current_index=current_index)
+        memory_maze._locked = bool(flags & _SNAPSHOT_LOCKED)
+        memory_maze._start_prefetch()
+        return memory_maze
+    
     @property
     def game_state(self) -> GameState:
         """
@@ -68,10 +186,94 @@ class MemoryMaze:
             elif result == SelectResult.INCORRECT:
                 self._game_state.lose_life()
                 if self._game_state.lives <= 0:
-                    return SelectResult.GAME_OVER
+                    result = SelectResult.GAME_OVER
+            if result is not None and self._subscribers:
+                self._notify(self._changes(result, x, y))
             return result
         return None
     
+    def select_many(self, moves) -> array:
+        """
+        Selects each grid coordinate in turn, exactly as if :meth:`select`
+        were called for each, stopping after the level is complete or the game
+        is over. Moves after that are not applied.
+
+        Arguments:
+            moves: Iterable of (x, y) grid coordinates.
+
+        Returns:
+            :class:`~array.array`: Signed byte array holding the
+                :class:`~SelectResult` value of each move applied, or
+                :data:`~memorymaze.result.NO_RESULT` where :meth:`select`
+                would return None.
+        """
+
+        results = array("b")
+
+        if self._locked:
+            results.extend(NO_RESULT for _ in moves)
+            return results
+
+        select = self._grid.select
+        append = results.append
+        # Changes are sent to subscribers as one change set, at the end
+        changes = [] if self._subscribers else None
+
+        for x, y in moves:
+            result = select(x, y)
+            if result is None:
+                append(NO_RESULT)
+                continue
+
+            if result is SelectResult.INCORRECT:
+                self._game_state.lose_life()
+                if self._game_state.lives <= 0:
+                    result = SelectResult.GAME_OVER
+            elif result is SelectResult.COMPLETE:
+                self._game_state.next_level()
+                self._generate_path()
+
+            append(result.value)
+
+            if changes is not None:
+                changes.extend(self._changes(result, x, y))
+
+            if result is SelectResult.COMPLETE or result is SelectResult.GAME_OVER:
+                break
+
+        if changes:
+            self._notify(changes)
+
+        return results
+    
+    def to_bytes(self) -> bytes:
+        """
+        Returns a compact snapshot of the session: the level, lives, whether
+        the game is locked, and the grid's path and progress along it. The
+        strategy that produced the path, and the constructor arguments, are
+        not included. Restore it with :meth:`from_bytes`.
+
+        Returns:
+            bytes
+        """
+
+        squares = self._grid.squares
+        flags = _SNAPSHOT_LOCKED if self._locked else 0
+        if squares is not None:
+            flags |= _SNAPSHOT_HAS_PATH
+
+        header = _SNAPSHOT_HEADER.pack(SNAPSHOT_VERSION, self._game_state.level, self._game_state.lives, flags,
+            self._grid.grid_size, self._grid.current_index)
+
+        if squares is None:
+            return header
+
+        if sys.byteorder != "little":
+            squares = array(squares.typecode, squares)
+            squares.byteswap()
+
+        return header + squares.tobytes()
+    
     def next_level(self):
         """
         Updates the game state to the next level and generates a new path.
@@ -79,14 +281,49 @@ class MemoryMaze:
 
         self._game_state.next_level()
         self._generate_path()
+
+        if self._subscribers:
+            self._notify([Change(ChangeType.LEVEL_CHANGED, value=self._game_state.level),
+                Change(ChangeType.PATH_READY)])
     
     def reset(self):
         """
-        Resets the game state and generates a new path.
+        Resets the game state and generates a new path. Any path being
+        prefetched is discarded.
         """
 
         self._game_state.reset()
         self._generate_path()
+
+        if self._subscribers:
+            self._notify([Change(ChangeType.LEVEL_CHANGED, value=self._game_state.level),
+                Change(ChangeType.LIVES_CHANGED, value=self._game_state.lives), Change(ChangeType.PATH_READY)])
+    
+    def subscribe(self, callback):
+        """
+        Registers a callback to be told what changed whenever the game
+        changes, so that frontends can update only what is affected. The
+        callback is called with a list of :class:`~Change` objects, in the
+        order they happened: one list per call to :meth:`select`,
+        :meth:`select_many`, :meth:`next_level` or :meth:`reset`.
+
+        Arguments:
+            callback: Function taking a list of changes.
+        """
+
+        self._subscribers += (callback,)
+    
+    def unsubscribe(self, callback):
+        """
+        Unregisters a callback registered with :meth:`subscribe`.
+
+        Arguments:
+            callback: The callback.
+        """
+
+        subscribers = list(self._subscribers)
+        subscribers.remove(callback)
+        self._subscribers = tuple(subscribers)
     
     def lock(self):
         """
@@ -107,7 +344,117 @@ class MemoryMaze:
     def _generate_path(self):
         """
         Convenience method for generating a new path on the grid, using the
-        path and grid size from the game state.
+        path and grid size from the game state. If the path for this level was
+        prefetched, it is used instead of generating it now. Prefetching the
+        next level's path is then started, if enabled.
+        """
+
+        level = self._game_state.level
+        prefetch = self._prefetch
+        self._prefetch = None
+
+        if prefetch is not None and self._prefetch_level == level:
+            # Waits for the prefetch if it is still running
+            path, path_strategy = prefetch.result()
+        else:
+            if prefetch is not None:
+                # Prefetched for a different level, e.g. after a reset
+                prefetch.cancel()
+            path, path_strategy = self._create_path(level)
+
+        self._grid.set_path(path, self._game_state.grid_size, path_strategy)
+        self._start_prefetch()
+    
+    def _setup(self, strategy: PathStrategy, prefetch: bool, seed, cache: PathCache | None,
+            level_pack: LevelPack | None, seen_paths: SeenPaths | None, game_state: GameState | None):
+        """
+        Sets up a new session without generating a path. See the constructor
+        for the arguments.
+        """
+
+        self._game_state = game_state if game_state is not None else GameState()
+        self._grid = MemoryMazeGrid(strategy, seed=seed, cache=cache, seen_paths=seen_paths)
+        self._level_pack = level_pack
+        self._locked = False
+        self._prefetch_enabled = prefetch
+        # Future for the prefetched path and the level it is for
+        self._prefetch = None
+        self._prefetch_level = 0
+        # A tuple, replaced rather than changed, so a callback can unsubscribe
+        # while being notified, and sessions without subscribers stay small
+        self._subscribers = ()
+    
+    def _changes(self, result: SelectResult, x: int, y: int) -> list[Change]:
+        """
+        Returns the changes caused by selecting a square, once the game state
+        is updated.
+
+        Arguments:
+            result (:class:`~SelectResult`): Result of the selection.
+            x (int): X grid coordinate.
+            y (int): Y grid coordinate.
+
+        Returns:
+            list
+        """
+
+        if result is SelectResult.CORRECT:
+            return [Change(ChangeType.TILE_CORRECT, (x, y))]
+
+        if result is SelectResult.COMPLETE:
+            return [Change(ChangeType.TILE_CORRECT, (x, y)),
+                Change(ChangeType.LEVEL_CHANGED, value=self._game_state.level), Change(ChangeType.PATH_READY)]
+
+        return [Change(ChangeType.TILE_INCORRECT, (x, y)), Change(ChangeType.SELECTION_RESET),
+            Change(ChangeType.LIVES_CHANGED, value=self._game_state.lives)]
+    
+    def _notify(self, changes: list[Change]):
+        """
+        Sends a change set to every subscriber.
+
+        Arguments:
+            changes (list): The changes.
+        """
+
+        for callback in self._subscribers:
+            callback(changes)
+    
+    def _start_prefetch(self):
+        """
+        Starts generating the next level's path in the background, if
+        prefetching is enabled.
+        """
+
+        if self._prefetch_enabled:
+            level = self._game_state.level + 1
+            self._prefetch_level = level
+            self._prefetch = _get_prefetch_executor().submit(self._create_path, level)
+    
+    def _create_path(self, level: int) -> tuple:
+        """
+        Creates a path for the given level without changing the grid, reading
+        it from the level pack if it has it, and it isn't corrupt. The path
+        search is limited so that level transitions stay fast.
+
+        Arguments:
+            level (int): The level.
+
+        Returns:
+            tuple: The path and the strategy that produced it.
         """
 
-        self._grid.generate_path(self._game_state.path_size, self._game_state.grid_size)
+        grid_size = self._game_state.grid_size_at(level)
+        path_size = self._game_state.path_size_at(level)
+
+        if self._level_pack is not None:
+            try:
+                packed = self._level_pack.level(level)
+            except ValueError:
+                # Generate the path instead
+                packed = None
+
+            if packed is not None and packed[0] == grid_size and len(packed[1]) == path_size:
+                return packed[1], None
+
+        deadline = time.monotonic() + SEARCH_TIME_LIMIT
+        return self._grid.create_path(path_size, grid_size, SEARCH_NODE_BUDGET, deadline)
@@ -1,6 +1,34 @@
-from memorymaze.tkinter.root import MemoryMazeRoot
+import argparse
+import multiprocessing
+
+from memorymaze import bench
+
+
+def main(args: list[str] | None = None):
+    """
+    Command line entry point. Starts the game, or runs a subcommand.
+
+    Arguments:
+        args (list): Command line arguments, None for :data:`sys.argv`.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m memorymaze", description="Memory Maze.")
+    subparsers = parser.add_subparsers(dest="command")
+    bench.add_arguments(subparsers.add_parser("bench", help="run the benchmark suite"))
+    args = parser.parse_args(args)
+
+    if args.command == "bench":
+        bench.run(args)
+    else:
+        # Only needed for the game, and needs a display
+        from memorymaze.tkinter.root import MemoryMazeRoot
+
+        app = MemoryMazeRoot()
+        app.mainloop()
 
 
 if __name__ == "__main__":
-    app = MemoryMazeRoot()
-    app.mainloop()
+    # Needed for path generation worker processes in the packaged .exe
+    multiprocessing.freeze_support()
+
+    main()
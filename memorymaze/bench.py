@@ -0,0 +1,364 @@
+"""
+Module for benchmarking the game logic: path generation, selecting squares,
+reading and writing the data file, its XOR codec, and memory use. Results
+can be written as JSON, to compare between releases.
+
+Run with ``python -m memorymaze bench``.
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from datetime import datetime, timezone
+
+from memorymaze import MemoryMaze
+from memorymaze.data import MemoryMazeData
+from memorymaze.data import xor_bytes
+from memorymaze.gamestate import GameState
+from memorymaze.gamestate import PATH_STRATEGY
+from memorymaze.grid import MemoryMazeGrid
+from memorymaze.grid import SEARCH_NODE_BUDGET
+from memorymaze.grid import SEARCH_TIME_LIMIT
+from memorymaze.strategy import PathStrategy
+
+# Version of the JSON results format.
+RESULTS_VERSION = 1
+
+# Defaults for the benchmark suite.
+DEFAULT_LEVELS = 20
+DEFAULT_ENTRIES = (10, 10000, 1000000)
+DEFAULT_SESSIONS = 100000
+DEFAULT_CODEC_MEGABYTES = (1, 16, 64)
+SELECT_GRID_SIZES = (10, 30, 100)
+
+
+def bench_generate_path(level: int, repeat: int = 20) -> dict:
+    """
+    Times generating paths for the given level, the way the game does, with
+    the search limited by :data:`~memorymaze.grid.SEARCH_NODE_BUDGET` and
+    :data:`~memorymaze.grid.SEARCH_TIME_LIMIT`.
+
+    Arguments:
+        level (int): The level.
+        repeat (int): Number of paths to generate.
+
+    Returns:
+        dict: Grid size, path length, median and maximum seconds per path,
+            and how many paths fell back to the constructive strategy.
+    """
+
+    game_state = GameState()
+    grid_size = game_state.grid_size_at(level)
+    path_length = game_state.path_size_at(level)
+    grid = MemoryMazeGrid(PATH_STRATEGY)
+
+    times = []
+    fallbacks = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        _, path_strategy = grid.create_path(path_length, grid_size, SEARCH_NODE_BUDGET,
+            time.monotonic() + SEARCH_TIME_LIMIT)
+        times.append(time.perf_counter() - start)
+        if path_strategy != PATH_STRATEGY:
+            fallbacks += 1
+
+    return {
+        "gridSize": grid_size,
+        "pathLength": path_length,
+        "medianSeconds": statistics.median(times),
+        "maxSeconds": max(times),
+        "fallbacks": fallbacks,
+    }
+
+
+def bench_select(path_length: int, grid_size: int, repeat: int = 5) -> float:
+    """
+    Times selecting every square of a path of the given length, along with a
+    click on the previously selected square before each one, which is
+    ignored but still has to be checked. Paths are built by the
+    :attr:`~PathStrategy.CONSTRUCTIVE` strategy, so long paths are quick to
+    set up.
+
+    Arguments:
+        path_length (int): Length of the path.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        repeat (int): Number of times to select the whole path. The fastest
+            time is kept.
+
+    Returns:
+        float: Seconds per select, on average.
+    """
+
+    grid = MemoryMazeGrid(PathStrategy.CONSTRUCTIVE, seed=0)
+    path = grid.generate_path(path_length, grid_size)
+    if path is None:
+        raise ValueError("No path of that length is possible")
+
+    best = float("inf")
+    for _ in range(repeat):
+        grid.set_path(path, grid_size)
+        previous = path[0]
+
+        start = time.perf_counter()
+        for square in path:
+            grid.select(*previous)
+            grid.select(*square)
+            previous = square
+        best = min(best, time.perf_counter() - start)
+
+    return best / (2 * path_length)
+
+
+def bench_data(entries: int) -> dict:
+    """
+    Times writing and reading a data file with the given number of history
+    entries. Reading only reads the statistics, as on startup, so loading the
+    history is timed separately.
+
+    Arguments:
+        entries (int): Number of history entries.
+
+    Returns:
+        dict: Seconds to write and read the file and to load its history, and
+            its size in bytes.
+    """
+
+    data = MemoryMazeData()
+    game_state = GameState()
+    rng = random.Random(0)
+    for _ in range(entries):
+        game_state.restore(rng.randint(1, 20), 0)
+        data.record(game_state)
+
+    with tempfile.TemporaryDirectory() as directory:
+        file = os.path.join(directory, "data.dat")
+
+        start = time.perf_counter()
+        if not data.write(file):
+            raise OSError("Could not write the data file")
+        write_seconds = time.perf_counter() - start
+
+        read = MemoryMazeData()
+        start = time.perf_counter()
+        if not read.read(file):
+            raise OSError("Could not read the data file")
+        read_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read.history
+        history_seconds = time.perf_counter() - start
+
+        file_bytes = os.path.getsize(file)
+
+    return {
+        "writeSeconds": write_seconds,
+        "readSeconds": read_seconds,
+        "historySeconds": history_seconds,
+        "fileBytes": file_bytes,
+    }
+
+
+def bench_codec(megabytes: int, repeat: int = 3) -> float:
+    """
+    Measures the throughput of the data file's XOR codec, see
+    :func:`~memorymaze.data.xor_bytes`.
+
+    Arguments:
+        megabytes (int): Size of the buffer, in megabytes.
+        repeat (int): Number of times to apply the codec. The fastest time is
+            kept.
+
+    Returns:
+        float: Megabytes per second.
+    """
+
+    data = random.Random(0).randbytes(megabytes * 1000000)
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        xor_bytes(data, 0)
+        best = min(best, time.perf_counter() - start)
+
+    return megabytes / best
+
+
+def bench_sessions(count: int = DEFAULT_SESSIONS) -> float:
+    """
+    Measures the memory held by live game sessions, by creating the given
+    number of :class:`~MemoryMaze` objects and keeping them all alive. Sessions
+    don't prefetch, so each holds exactly one path.
+
+    Arguments:
+        count (int): Number of sessions to create.
+
+    Returns:
+        float: Bytes per session, on average.
+    """
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        sessions = [MemoryMaze(prefetch=False) for _ in range(count)]
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    del sessions
+    return (after - before) / count
+
+
+def peak_memory(function, *args) -> int:
+    """
+    Runs a function under :mod:`tracemalloc` and returns the most memory it
+    had allocated at once. Tracing slows the function down, so time it
+    separately.
+
+    Arguments:
+        function: Function to run.
+        args: Arguments to pass to the function.
+
+    Returns:
+        int: Peak bytes allocated.
+    """
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        function(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return peak - before
+
+
+def run_benchmarks(levels: int = DEFAULT_LEVELS, entries: tuple[int] = DEFAULT_ENTRIES,
+        sessions: int = DEFAULT_SESSIONS, memory: bool = True, log=print,
+        codec_megabytes: tuple[int] = DEFAULT_CODEC_MEGABYTES) -> dict:
+    """
+    Runs the benchmark suite.
+
+    Arguments:
+        levels (int): Generate paths for levels 1 to this level.
+        entries (tuple): History sizes to read and write the data file with.
+        sessions (int): Number of sessions to measure memory with, 0 to skip.
+        memory (bool): Whether to measure peak memory, which runs each
+            benchmark again under :mod:`tracemalloc`.
+        log: Function to report progress with, taking a string.
+        codec_megabytes (tuple): Buffer sizes to apply the XOR codec to, in
+            megabytes.
+
+    Returns:
+        dict: JSON-serializable results.
+    """
+
+    results = {
+        "version": RESULTS_VERSION,
+        "date": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "generatePath": {},
+        "select": {},
+        "data": {},
+        "codec": {},
+    }
+
+    for level in range(1, levels + 1):
+        result = bench_generate_path(level)
+        if memory:
+            result["peakBytes"] = peak_memory(bench_generate_path, level, 1)
+        results["generatePath"][str(level)] = result
+        log(f"generate_path level {level:>3}: median {result['medianSeconds'] * 1e6:10.0f} us, "
+            f"max {result['maxSeconds'] * 1e6:10.0f} us, {result['fallbacks']} fallbacks")
+
+    for grid_size in SELECT_GRID_SIZES:
+        # Longest path the constructive strategy can build on the grid
+        path_length = grid_size + (grid_size - 2) * (grid_size - 1)
+        seconds = bench_select(path_length, grid_size)
+        results["select"][str(path_length)] = {"gridSize": grid_size, "secondsPerSelect": seconds,
+            "selectsPerSecond": 1 / seconds}
+        log(f"select path length {path_length:>8}: {seconds * 1e9:10.0f} ns, {1 / seconds:12.0f} per second")
+
+    for count in entries:
+        result = bench_data(count)
+        if memory:
+            result["peakBytes"] = peak_memory(bench_data, count)
+        results["data"][str(count)] = result
+        log(f"data {count:>8} entries: write {result['writeSeconds'] * 1e3:10.1f} ms, "
+            f"read {result['readSeconds'] * 1e3:10.1f} ms, "
+            f"history {result['historySeconds'] * 1e3:10.1f} ms, {result['fileBytes']} bytes")
+
+    for megabytes in codec_megabytes:
+        megabytes_per_second = bench_codec(megabytes)
+        results["codec"][str(megabytes)] = {"megabytesPerSecond": megabytes_per_second}
+        log(f"codec {megabytes:>6} MB: {megabytes_per_second:10.1f} MB/s")
+
+    if sessions:
+        results["bytesPerSession"] = bench_sessions(sessions)
+        log(f"memory per session: {results['bytesPerSession']:.0f} bytes")
+
+    return results
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """
+    Adds the benchmark command line arguments to a parser.
+
+    Arguments:
+        parser (:class:`~argparse.ArgumentParser`): The parser.
+    """
+
+    parser.add_argument("--levels", type=int, default=DEFAULT_LEVELS,
+        help="generate paths for levels 1 to LEVELS")
+    parser.add_argument("--entries", type=lambda value: tuple(int(count) for count in value.split(",")),
+        default=DEFAULT_ENTRIES, help="comma-separated history sizes for the data file")
+    parser.add_argument("--codec-megabytes",
+        type=lambda value: tuple(int(size) for size in value.split(",")), default=DEFAULT_CODEC_MEGABYTES,
+        help="comma-separated buffer sizes for the XOR codec, in megabytes")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS,
+        help="sessions to measure memory with, 0 to skip")
+    parser.add_argument("--no-memory", action="store_true", help="don't measure peak memory")
+    parser.add_argument("--output", help="file to write the results to as JSON")
+
+
+def run(args: argparse.Namespace):
+    """
+    Runs the benchmark suite with parsed command line arguments, see
+    :func:`add_arguments`.
+
+    Arguments:
+        args (:class:`~argparse.Namespace`): Parsed arguments.
+    """
+
+    results = run_benchmarks(args.levels, args.entries, args.sessions, not args.no_memory,
+        codec_megabytes=args.codec_megabytes)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+def main(args: list[str] | None = None):
+    """
+    Command line entry point for the benchmark suite.
+
+    Arguments:
+        args (list): Command line arguments, None for :data:`sys.argv`.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m memorymaze.bench", description="Benchmark Memory Maze.")
+    add_arguments(parser)
+    run(parser.parse_args(args))
+
+
+if __name__ == "__main__":
+    main()
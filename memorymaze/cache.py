@@ -0,0 +1,159 @@
+"""
+Module for persisting generated paths on disk, so paths for a seed only have
+to be generated once.
+"""
+
+import json
+import os
+import threading
+import traceback
+
+from collections import OrderedDict
+
+from memorymaze.strategy import PathStrategy
+from memorymaze.util import resource_path
+from memorymaze.util import write_file_atomic
+
+DEFAULT_CACHE_FILE = resource_path("paths.json")
+
+# How many paths to keep by default.
+DEFAULT_CAPACITY = 1000
+
+# Version of the cache file format.
+FILE_VERSION = 1
+
+
+class PathCache:
+    """
+    Least recently used cache of generated paths, keyed by seed, strategy,
+    grid size and path length, and stored in a JSON file.
+    The strategy is part of the key because each strategy produces a
+    different path from the same seed. The file is read on first use, and
+    written whenever a path is added.
+
+    Arguments:
+        file (str): Path where the cache file is stored.
+        capacity (int): Maximum number of paths to keep. The least recently
+            used paths are evicted first.
+    """
+
+    def __init__(self, file: str = DEFAULT_CACHE_FILE, capacity: int = DEFAULT_CAPACITY):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+
+        self._file = file
+        self._capacity = capacity
+        self._entries = None
+        # Paths may be generated on another thread, see MemoryMaze
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+    def get(self, seed, strategy: PathStrategy, grid_size: int, path_length: int) -> tuple | None:
+        """
+        Returns the cached path for the given key, marking it as recently
+        used. Returns None if there is no cached path.
+
+        Arguments:
+            seed: Seed the path was generated from.
+            strategy (:class:`~PathStrategy`): Strategy asked to generate the
+                path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            path_length (int): Length of the path.
+
+        Returns:
+            tuple: The path and the strategy that produced it.
+        """
+
+        key = self._key(seed, strategy, grid_size, path_length)
+
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(key)
+            if entry is None:
+                return None
+            entries.move_to_end(key)
+
+        path = [(square % grid_size, square // grid_size) for square in entry["path"]]
+        return path, PathStrategy(entry["strategy"])
+
+    def put(self, seed, strategy: PathStrategy, grid_size: int, path_length: int, path: list[tuple[int]],
+            path_strategy: PathStrategy):
+        """
+        Adds a path to the cache, evicting the least recently used paths if
+        the cache is full, and writes the cache file.
+
+        Arguments:
+            seed: Seed the path was generated from.
+            strategy (:class:`~PathStrategy`): Strategy asked to generate the
+                path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            path_length (int): Length of the path.
+            path (list): The path.
+            path_strategy (:class:`~PathStrategy`): Strategy that produced the
+                path, which differs from the one asked for if it fell back.
+        """
+
+        key = self._key(seed, strategy, grid_size, path_length)
+        entry = {
+            "path": [y * grid_size + x for x, y in path],
+            "strategy": path_strategy.value,
+        }
+
+        with self._lock:
+            entries = self._load()
+            entries[key] = entry
+            entries.move_to_end(key)
+            while len(entries) > self._capacity:
+                entries.popitem(last=False)
+            self._write(entries)
+
+    def _key(self, seed, strategy: PathStrategy, grid_size: int, path_length: int) -> str:
+        """
+        Returns the key of a path in the cache file.
+
+        Returns:
+            str
+        """
+
+        return f"{seed!r}:{strategy.value}:{grid_size}:{path_length}"
+
+    def _load(self) -> OrderedDict:
+        """
+        Returns the cached entries, reading the cache file on first use. A
+        missing or unreadable file gives an empty cache.
+
+        Returns:
+            OrderedDict
+        """
+
+        if self._entries is None:
+            self._entries = OrderedDict()
+
+            if os.path.exists(self._file):
+                try:
+                    with open(self._file, "r") as f:
+                        data = json.load(f)
+                    if data["version"] == FILE_VERSION:
+                        self._entries.update(data["entries"])
+                except:
+                    print(traceback.format_exc())
+
+        return self._entries
+
+    def _write(self, entries: OrderedDict):
+        """
+        Writes the entries to the cache file, least recently used first,
+        replacing it in one step so it is never left partly written.
+
+        Arguments:
+            entries (OrderedDict): Entries to write.
+        """
+
+        try:
+            write_file_atomic(self._file, json.dumps({"version": FILE_VERSION, "entries": entries},
+                separators=(",", ":")))
+        except:
+            print(traceback.format_exc())
@@ -0,0 +1,92 @@
+from enum import Enum
+
+class ChangeType(Enum):
+    """
+    Enum identifying what changed in the game, so frontends can update only
+    what is affected.
+
+    Attributes:
+        TILE_CORRECT: A square was selected correctly. The change has the
+            square's position.
+        TILE_INCORRECT: A square was selected incorrectly. The change has the
+            square's position.
+        SELECTION_RESET: The squares selected so far were cleared, after an
+            incorrect selection.
+        LEVEL_CHANGED: The level changed. The change has the new level.
+        LIVES_CHANGED: The number of lives changed. The change has the number
+            of lives remaining.
+        PATH_READY: A new path was set on the grid, possibly of a different
+            grid size, so the whole grid is affected.
+    """
+
+    TILE_CORRECT = "tile_correct"
+    TILE_INCORRECT = "tile_incorrect"
+    SELECTION_RESET = "selection_reset"
+    LEVEL_CHANGED = "level_changed"
+    LIVES_CHANGED = "lives_changed"
+    PATH_READY = "path_ready"
+
+
+class Change:
+    """
+    Class encapsulating one change in the game.
+
+    Arguments:
+        type (:class:`~ChangeType`): What changed.
+        position (tuple): Grid coordinates of the affected square, if any.
+        value (int): New level or number of lives, if any.
+    """
+
+    __slots__ = ("_type", "_position", "_value")
+
+    def __init__(self, type: ChangeType, position: tuple[int] | None = None, value: int | None = None):
+        self._type = type
+        self._position = position
+        self._value = value
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Change):
+            return NotImplemented
+
+        return (self._type, self._position, self._value) == (other._type, other._position, other._value)
+
+    def __hash__(self) -> int:
+        return hash((self._type, self._position, self._value))
+
+    def __repr__(self) -> str:
+        return f"Change({self._type}, {self._position!r}, {self._value!r})"
+
+    @property
+    def type(self) -> ChangeType:
+        """
+        Returns what changed.
+
+        Returns:
+            :class:`~ChangeType`
+        """
+
+        return self._type
+
+    @property
+    def position(self) -> tuple[int] | None:
+        """
+        Returns the grid coordinates of the affected square. Returns None if
+        the change isn't about a single square.
+
+        Returns:
+            tuple
+        """
+
+        return self._position
+
+    @property
+    def value(self) -> int | None:
+        """
+        Returns the new level or number of lives. Returns None for other
+        changes.
+
+        Returns:
+            int
+        """
+
+        return self._value
@@ -1,11 +1,22 @@
 """
 Module encapsulating persisting data for the game.
+
+The data file is a small header holding the number of playthroughs, the sum and
+sum of squares of their scores, and the high score, followed by one fixed-size
+record per playthrough, so a finished game only appends its record and rewrites
+the header instead of rewriting the whole file. The whole file is obfuscated
+with a repeating XOR key, applied at absolute file offsets so that any part can
+be read or written on its own. Files in the old XML format are converted to the
+new format when read, a chunk at a time, so even huge files take little memory.
 """
 
+import functools
+import math
 import os
+import struct
 import traceback
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 
 import xml.etree.cElementTree as ET
 
@@ -18,6 +29,194 @@ DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
 
 ENCRYPTION_KEY = "memory-maze"
 
+MAGIC = b"MMDF"
+
+# Version of the data file format.
+FILE_VERSION = 2
+
+# Magic and version, at the start of every version of the header.
+_PREAMBLE = struct.Struct("<4sH")
+
+# Magic, version, high score, and number of playthroughs, sum of scores and
+# sum of squared scores.
+_HEADER = struct.Struct("<4sHIQQQ")
+
+# Magic, version and high score, in version 1.
+_HEADER_V1 = struct.Struct("<4sHI")
+
+# Date completed, in microseconds since the epoch in UTC, and score.
+_RECORD = struct.Struct("<qI")
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+_KEY = ENCRYPTION_KEY.encode()
+
+# Buffers are XORed in blocks of this size, a multiple of the key length, so
+# each block uses the same key. Buffers at least this big use NumPy, if it's
+# installed.
+_BLOCK_SIZE = len(_KEY) * 6000
+
+# Old XML data files are decrypted and parsed in chunks of this size. Every
+# element parsed from a chunk is alive at once, so this bounds memory use.
+_LEGACY_CHUNK_SIZE = 1 << 16
+
+# Entries converted from old XML data files are written in batches of this
+# many.
+_LEGACY_BATCH_SIZE = 10000
+
+
+@functools.cache
+def _numpy():
+    """
+    Returns the NumPy module, or None if it isn't installed. Only imported
+    when first needed, as it's slow to import.
+    """
+
+    try:
+        import numpy
+    except ImportError:
+        return None
+
+    return numpy
+
+
+@functools.cache
+def _key_block(phase: int) -> int:
+    """
+    Returns a block of the key, starting from the given position in the key,
+    as a little-endian integer.
+
+    Arguments:
+        phase (int): Position in the key.
+
+    Returns:
+        int
+    """
+
+    return int.from_bytes((_KEY[phase:] + _KEY[:phase]) * (_BLOCK_SIZE // len(_KEY)), "little")
+
+
+def xor_bytes(data: bytes, offset: int = 0) -> bytes:
+    """
+    Applies the XOR obfuscation to data stored at the given file offset.
+    Applying it twice gives back the original data.
+
+    The whole buffer is XORed at once, as one big integer, or as a NumPy
+    array for big buffers, rather than byte by byte.
+
+    Arguments:
+        data (bytes): The data.
+        offset (int): Offset of the data in the file.
+
+    Returns:
+        bytes
+    """
+
+    length = len(data)
+    phase = offset % len(_KEY)
+
+    if length < _BLOCK_SIZE:
+        key = ((_KEY[phase:] + _KEY[:phase]) * (length // len(_KEY) + 1))[:length]
+        return (int.from_bytes(data, "little") ^ int.from_bytes(key, "little")).to_bytes(length, "little")
+
+    np = _numpy()
+    if np is not None:
+        key = np.frombuffer(_KEY[phase:] + _KEY[:phase], dtype=np.uint8)
+        return (np.frombuffer(data, dtype=np.uint8) ^ np.resize(key, length)).tobytes()
+
+    # Blocks keep the integers small enough to stay in the CPU cache
+    key = _key_block(phase)
+    view = memoryview(data)
+    result = bytearray(length)
+
+    for start in range(0, length, _BLOCK_SIZE):
+        block = view[start:start + _BLOCK_SIZE]
+        result[start:start + len(block)] = \
+            (int.from_bytes(block, "little") ^ key).to_bytes(_BLOCK_SIZE, "little")[:len(block)]
+
+    return bytes(result)
+
+
+def _to_microseconds(date: datetime) -> int:
+    """
+    Returns the given datetime in microseconds since the epoch. Datetimes
+    without a time zone are in UTC, as in old data files.
+
+    Arguments:
+        date (datetime): The datetime.
+
+    Returns:
+        int
+    """
+
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+
+    return (date - _EPOCH) // timedelta(microseconds=1)
+
+
+def _read_entries(f, header_size: int, start: int, stop: int) -> list:
+    """
+    Reads a range of records from a data file.
+
+    Arguments:
+        f: The file, open for reading.
+        header_size (int): Size of the file's header.
+        start (int): Index of the first record.
+        stop (int): Index after the last record.
+
+    Returns:
+        list: :class:`~HistoryEntry` objects.
+    """
+
+    offset = header_size + start * _RECORD.size
+    f.seek(offset)
+    records = xor_bytes(f.read((stop - start) * _RECORD.size), offset)
+
+    return [HistoryEntry(_EPOCH + timedelta(microseconds=microseconds), score)
+        for microseconds, score in _RECORD.iter_unpack(records)]
+
+
+def _parse_legacy(f, add_entry) -> int:
+    """
+    Parses an old XML data file, decrypting and parsing a chunk at a time,
+    and clearing each entry once it's parsed, so that memory use doesn't grow
+    with the size of the file.
+
+    Arguments:
+        f: The file, open for reading.
+        add_entry: Function called with each :class:`~HistoryEntry`, in
+            order.
+
+    Returns:
+        int: The high score.
+    """
+
+    parser = ET.XMLPullParser(events=("start", "end"))
+    high_score = 0
+    history = None
+    offset = 0
+
+    while chunk := f.read(_LEGACY_CHUNK_SIZE):
+        parser.feed(xor_bytes(chunk, offset))
+        offset += len(chunk)
+
+        for event, element in parser.read_events():
+            if event == "start":
+                if element.tag == "history":
+                    history = element
+            elif element.tag == "entry":
+                # Much faster than strptime, and DATETIME_FORMAT is ISO 8601
+                date_completed = datetime.fromisoformat(element.findtext("dateCompleted"))
+                add_entry(HistoryEntry(date_completed, int(element.findtext("score"))))
+                # Entries parsed after this one are still in the events
+                history.clear()
+            elif element.tag == "highScore":
+                high_score = int(element.text)
+
+    parser.close()
+    return high_score
+
 
 class HistoryEntry:
     """
@@ -28,6 +227,8 @@ class HistoryEntry:
         score (int): Level the player reached in this playthrough.
     """
 
+    __slots__ = ("_date_completed", "_score")
+
     def __init__(self, date_completed: datetime, score: int):
         self._date_completed = date_completed
         self._score = score
@@ -74,7 +275,19 @@ class MemoryMazeData:
 
     def __init__(self):
         self._high_score = 0
+        # All the entries, or None until they're read from the file
         self._history = []
+        # Entries recorded since the file was last written
+        self._unwritten = []
+        # Totals of the scores, to give statistics without going through the
+        # history
+        self._count = 0
+        self._sum = 0
+        self._sum_of_squares = 0
+        # File in the current format holding the first _written entries, or
+        # None if there isn't one
+        self._file = None
+        self._written = 0
     
     @property
     def high_score(self) -> int:
@@ -87,21 +300,71 @@ class MemoryMazeData:
 
         return self._high_score
     
+    @property
+    def history(self) -> list[HistoryEntry]:
+        """
+        All the playthroughs, oldest first. Entries in the data file are only
+        read the first time the history is needed, as the statistics don't
+        need them.
+
+        Returns:
+            list
+        """
+
+        if self._history is None:
+            self._history = self._read_history() + self._unwritten
+
+        return self._history
+    
+    @property
+    def games_played(self) -> int:
+        """
+        The number of playthroughs.
+
+        Returns:
+            int
+        """
+
+        return self._count
+    
     @property
     def average(self) -> float:
         """
-        The average score of all the playthroughs.
+        The average score of all the playthroughs. Returns 0 if there are
+        none.
 
         Returns:
             float
         """
 
-        return sum(map(lambda e: e.score, self._history)) / len(self._history)
+        if self._count == 0:
+            return 0.0
+
+        return self._sum / self._count
+    
+    @property
+    def stddev(self) -> float:
+        """
+        The standard deviation of the scores of all the playthroughs. Returns
+        0 if there are none.
+
+        Returns:
+            float
+        """
+
+        if self._count == 0:
+            return 0.0
+
+        # Exact in integers, so there's no cancellation error
+        return math.sqrt(self._count * self._sum_of_squares - self._sum * self._sum) / self._count
     
     def read(self, file: str) -> bool:
         """
-        Reads the Memory Maze data from the file at the given path. Returns
-        whether reading was successful.
+        Reads the Memory Maze data from the file at the given path, replacing
+        any data in memory. Returns whether reading was successful. Only the
+        header is read, see :attr:`history`, unless the file is in version 1
+        of the format. Files in the old XML format are converted to the
+        current format first.
 
         Arguments:
             file (str): Path where the file is stored.
@@ -113,23 +376,21 @@ class MemoryMazeData:
         if os.path.exists(file):
             try:
                 with open(file, "rb") as f:
-                    encrypted = f.read()
-                    xml_bytes = bytearray()
-                    for i in range(len(encrypted)):
-                        # Decrypt data using simple xor encryption
-                        xml_bytes.append(encrypted[i] ^ ord(ENCRYPTION_KEY[i % len(ENCRYPTION_KEY)]))
-                    
-                    root = ET.fromstring(xml_bytes)
-                    
-                    self._high_score = int(root.find("highScore").text)
-
-                    for entry in root.find("history"):
-                        date_completed_str = entry.find("dateCompleted")
-                        date_completed = datetime.strptime(date_completed_str.text, DATETIME_FORMAT)
-                        score = int(entry.find("score").text)
-                        self._history.append(HistoryEntry(date_completed, score))
-                    
-                    return True
+                    header = xor_bytes(f.read(_HEADER.size), 0)
+
+                    converted = None
+                    if header[:len(MAGIC)] == MAGIC:
+                        self._read_records(file, f, header)
+                    else:
+                        f.seek(0)
+                        converted = self._read_legacy(file, f)
+
+                # Replaced once closed, as an open file can't be replaced on
+                # Windows
+                if converted is not None:
+                    self._replace_legacy(file, converted)
+
+                return True
             except:
                 print(traceback.format_exc())
                 return False
@@ -156,16 +417,22 @@ class MemoryMazeData:
             game_state (:class:`~GameState`): The game state to record.
         """
 
-        if game_state.level > self._high_score:
-            self._high_score = game_state.level
+        entry = HistoryEntry.now(game_state.level)
+        self._unwritten.append(entry)
+        if self._history is not None:
+            self._history.append(entry)
 
-        self._history.append(HistoryEntry.now(game_state.level))
+        self._add(game_state.level)
     
     def write(self, file: str) -> bool:
         """
         Writes the Memory Maze data to the file at the given path. Returns
         whether writing was successful.
 
+        If the file is the one last read or written, only the entries recorded
+        since are appended to it, along with the header. Otherwise the whole
+        file is written.
+
         Arguments:
             file (str): Path where the file should be written.
         
@@ -174,32 +441,23 @@ class MemoryMazeData:
         """
 
         try:
+            if file == self._file and os.path.exists(file):
+                with open(file, "r+b") as f:
+                    end = f.seek(0, os.SEEK_END)
+                    # Otherwise the file changed, or an append failed part way
+                    if end == _HEADER.size + self._written * _RECORD.size:
+                        self._append(f, end, self._unwritten)
+                        return True
+
+            # Before the file is replaced, if it's the one the history is in
+            history = self.history
+            self._file = None
             with open(file, "wb") as f:
-                root = ET.Element("memoryMaze")
-                ET.SubElement(root, "history")
-
-                high_score_node = ET.SubElement(root, "highScore")
-                high_score_node.text = str(self._high_score)
-
-                for entry in self._history:
-                    history_node = root.find("history")
-                    entry_node = ET.SubElement(history_node, "entry")
-                    date_completed_node = ET.SubElement(entry_node, "dateCompleted")
-                    date_completed_node.text = entry.date_completed.strftime(DATETIME_FORMAT)
-                    score_node = ET.SubElement(entry_node, "score")
-                    score_node.text = str(entry.score)
-
-                ET.indent(root)
+                self._written = 0
+                self._append(f, _HEADER.size, history)
 
-                xml_str = ET.tostring(root)
-                encrypted = bytearray()
-
-                for i in range(len(xml_str)):
-                    encrypted.append(xml_str[i] ^ ord(ENCRYPTION_KEY[i % len(ENCRYPTION_KEY)]))
-                
-                f.write(encrypted)
-
-                return True
+            self._file = file
+            return True
         except:
             print(traceback.format_exc())
             return False
@@ -214,3 +472,196 @@ class MemoryMazeData:
         """
 
         return self.write(DEFAULT_DATA_FILE)
+
+    def _add(self, score: int):
+        """
+        Adds a score to the totals and the high score.
+
+        Arguments:
+            score (int): The score.
+        """
+
+        self._count += 1
+        self._sum += score
+        self._sum_of_squares += score * score
+        if score > self._high_score:
+            self._high_score = score
+
+    def _recount(self, high_score: int = 0):
+        """
+        Recomputes the totals from the history.
+
+        Arguments:
+            high_score (int): High score to start from, which may be higher
+                than any score in the history.
+        """
+
+        self._high_score = high_score
+        self._count = self._sum = self._sum_of_squares = 0
+        for entry in self._history:
+            self._add(entry.score)
+
+    def _append(self, f, offset: int, entries: list[HistoryEntry]):
+        """
+        Appends entries to the file, then rewrites the header. The header is
+        written last, so it never counts entries that aren't in the file.
+
+        Arguments:
+            f: The file, open for writing.
+            offset (int): Offset of the end of the file.
+            entries (list): Entries to append.
+        """
+
+        records = b"".join(_RECORD.pack(_to_microseconds(entry.date_completed), entry.score)
+            for entry in entries)
+
+        f.seek(offset)
+        f.write(xor_bytes(records, offset))
+        self._written += len(entries)
+        self._unwritten = []
+
+        f.seek(0)
+        f.write(xor_bytes(_HEADER.pack(MAGIC, FILE_VERSION, self._high_score, self._count, self._sum,
+            self._sum_of_squares), 0))
+
+    def _read_records(self, file: str, f, header: bytes):
+        """
+        Reads data in the current format, or version 1. Only the header, and
+        any records it doesn't count yet, are read in the current format. A
+        record cut short by a failed append is ignored, and dropped the next
+        time the data is written.
+
+        Arguments:
+            file (str): Path where the file is stored.
+            f: The file, open for reading.
+            header (bytes): Start of the file, decrypted.
+        """
+
+        _, version = _PREAMBLE.unpack_from(header)
+        if version == 1:
+            header_size = _HEADER_V1.size
+        elif version == FILE_VERSION:
+            header_size = _HEADER.size
+        else:
+            raise ValueError(f"Unsupported data file version {version}")
+
+        count = (f.seek(0, os.SEEK_END) - header_size) // _RECORD.size
+        self._unwritten = []
+
+        if version == 1:
+            _, _, high_score = _HEADER_V1.unpack_from(header)
+            self._history = _read_entries(f, header_size, 0, count)
+            self._recount(high_score)
+            # Rewritten in the current format next time
+            self._file = None
+            self._written = 0
+            return
+
+        _, _, self._high_score, self._count, self._sum, self._sum_of_squares = _HEADER.unpack(header)
+        if count >= self._count:
+            # The header is written after the records, so may be behind them
+            for entry in _read_entries(f, header_size, self._count, count):
+                self._add(entry.score)
+            self._history = None
+        else:
+            self._history = _read_entries(f, header_size, 0, count)
+            self._recount(self._high_score)
+
+        self._file = file
+        self._written = count
+
+    def _read_history(self) -> list[HistoryEntry]:
+        """
+        Reads the entries in the data file. An unreadable file gives no
+        entries.
+
+        Returns:
+            list
+        """
+
+        try:
+            with open(self._file, "rb") as f:
+                return _read_entries(f, _HEADER.size, 0, self._written)
+        except:
+            print(traceback.format_exc())
+            return []
+
+    def _read_legacy(self, file: str, f) -> str | None:
+        """
+        Reads data in the old XML format, converting it to the current format
+        in a temporary file, which replaces the old file once it's closed, see
+        :meth:`_replace_legacy`. If the temporary file can't be written, the
+        data is kept in memory instead, and written in the current format next
+        time.
+
+        Arguments:
+            file (str): Path where the file is stored.
+            f: The file, open for reading.
+
+        Returns:
+            str: Path of the converted file, None if the data is kept in
+                memory.
+        """
+
+        self._history = []
+        self._unwritten = []
+        self._high_score = self._count = self._sum = self._sum_of_squares = 0
+        self._file = None
+        self._written = 0
+        temporary = file + ".tmp"
+
+        try:
+            with open(temporary, "wb") as converted:
+                batch = []
+
+                def add_entry(entry: HistoryEntry):
+                    batch.append(entry)
+                    self._add(entry.score)
+                    if len(batch) == _LEGACY_BATCH_SIZE:
+                        self._append(converted, _HEADER.size + self._written * _RECORD.size, batch)
+                        batch.clear()
+
+                self._high_score = max(self._high_score, _parse_legacy(f, add_entry))
+                self._append(converted, _HEADER.size + self._written * _RECORD.size, batch)
+        except OSError:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+
+            f.seek(0)
+            self._written = 0
+            high_score = _parse_legacy(f, self._history.append)
+            self._recount(high_score)
+            return None
+        except:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+
+        self._history = None
+        return temporary
+
+    def _replace_legacy(self, file: str, converted: str):
+        """
+        Replaces an old XML data file with its converted file, written by
+        :meth:`_read_legacy`. If the file can't be replaced, the history is
+        read back from the converted file and kept in memory instead, and
+        written in the current format next time.
+
+        Arguments:
+            file (str): Path where the file is stored.
+            converted (str): Path of the converted file.
+        """
+
+        try:
+            os.replace(converted, file)
+        except OSError:
+            try:
+                with open(converted, "rb") as f:
+                    self._history = _read_entries(f, _HEADER.size, 0, self._written)
+            finally:
+                os.remove(converted)
+
+            self._written = 0
+            return
+
+        self._file = file
@@ -1,3 +1,5 @@
+from memorymaze.strategy import PathStrategy
+
 # Grid size on Level 1.
 START_GRID_SIZE = 5
 
@@ -9,16 +11,53 @@ STARTING_LIVES = 3
 # difficulty, and that a it isn't just a straight line, for example.
 PATH_SIZE_MULTIPLER = 1.6
 
+# Strategy used to generate the path for each level. The search gives the most
+# varied paths, while the constructive strategy takes time linear in the path
+# length no matter how large the grid gets.
+PATH_STRATEGY = PathStrategy.BACKTRACK
+
 
 class GameState:
     """
     Class for capturing the state of the game, such as the current level and
     number of lives.
+
+    Arguments:
+        start_grid_size (int): Grid size on level 1.
+        starting_lives (int): How many lives to start with.
+        path_size_multiplier (float): Multiplier to use when calculating how
+            long the path should be based on the grid size.
     """
+
+    __slots__ = ("_level", "_lives", "_start_grid_size", "_starting_lives", "_path_size_multiplier")
     
-    def __init__(self):
+    def __init__(self, start_grid_size: int = START_GRID_SIZE, starting_lives: int = STARTING_LIVES,
+            path_size_multiplier: float = PATH_SIZE_MULTIPLER):
+        if start_grid_size <= 0:
+            raise ValueError("Start grid size must be positive")
+
+        if starting_lives <= 0:
+            raise ValueError("Starting lives must be positive")
+
+        # Paths run from the bottom row to the top row, so are at least as
+        # long as the grid size
+        if path_size_multiplier < 1:
+            raise ValueError("Path size multiplier must be at least 1")
+
+        # Paths can be at most one square longer than the grid size for each
+        # square of the rows in between. That's only a limit on small grids,
+        # as it grows with the square of the grid size
+        grid_size = start_grid_size
+        while grid_size < path_size_multiplier + 2:
+            if round(grid_size * path_size_multiplier) > grid_size + (grid_size - 2) * (grid_size - 1):
+                raise ValueError(f"Paths would be too long for a grid size of {grid_size}")
+            grid_size += 1
+
+        self._start_grid_size = start_grid_size
+        self._starting_lives = starting_lives
+        self._path_size_multiplier = path_size_multiplier
         self._level = 1
-        self._lives = STARTING_LIVES
+        self._lives = starting_lives
     
     @property
     def level(self) -> int:
@@ -85,7 +124,7 @@ class GameState:
             int
         """
 
-        return self._level + START_GRID_SIZE - 1
+        return self.grid_size_at(self._level)
     
     @property
     def path_size(self) -> int:
@@ -96,7 +135,34 @@ class GameState:
             int
         """
 
-        return round(self.grid_size * PATH_SIZE_MULTIPLER)
+        return self.path_size_at(self._level)
+    
+    def grid_size_at(self, level: int) -> int:
+        """
+        Returns the grid size for the given level.
+
+        Arguments:
+            level (int): The level.
+
+        Returns:
+            int
+        """
+
+        return level + self._start_grid_size - 1
+    
+    def path_size_at(self, level: int) -> int:
+        """
+        Returns the desired path size for the given level, based on its grid
+        size.
+
+        Arguments:
+            level (int): The level.
+
+        Returns:
+            int
+        """
+
+        return round(self.grid_size_at(level) * self._path_size_multiplier)
     
     def reset(self):
         """
@@ -104,4 +170,22 @@ class GameState:
         """
 
         self._level = 1
-        self._lives = STARTING_LIVES
+        self._lives = self._starting_lives
+    
+    def restore(self, level: int, lives: int):
+        """
+        Restores the game to a saved level and number of lives.
+
+        Arguments:
+            level (int): The level.
+            lives (int): Number of lives remaining.
+        """
+
+        if level < 1:
+            raise ValueError("Level must be positive")
+
+        if lives < 0:
+            raise ValueError("Lives must not be negative")
+
+        self._level = level
+        self._lives = lives
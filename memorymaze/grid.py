@@ -1,30 +1,417 @@
+import os
 import random
+import threading
+import time
 
+from array import array
+from bisect import bisect_left
+from collections.abc import Sequence
+
+from memorymaze.cache import PathCache
 from memorymaze.result import SelectResult
+from memorymaze.sampler import sample_path
+from memorymaze.seen import SeenPaths
+from memorymaze.strategy import PathStrategy
+
+# Limits on the path search used by the game, keeping level transitions fast.
+# When either is hit, the path is built by the constructive fallback instead.
+SEARCH_NODE_BUDGET = 10000
+SEARCH_TIME_LIMIT = 0.02
+
+# How many times to generate a path again when it was seen before, see
+# MemoryMazeGrid. On small grids every path may have been seen, so the last
+# one is kept regardless.
+MAX_REROLLS = 8
+
+# Reachability tables, keyed by grid size. Entry ``r`` of a table is a bitmask
+# of the rows from which the top row can be reached by placing exactly ``r``
+# more squares.
+_REACHABILITY = {}
+
+# Neighbour masks, keyed by grid size. See _neighbour_masks().
+_NEIGHBOURS = {}
+
+# Zobrist tables for fingerprinting paths, keyed by grid size. See path_hash().
+_ZOBRIST = {}
+
+# Guards extending the reachability tables, as paths may be generated on
+# several threads at once.
+_REACHABILITY_LOCK = threading.Lock()
+
+
+def _reachable_rows(grid_size: int, remaining: int) -> int:
+    """
+    Returns a bitmask of the rows from which a path can end on the top row
+    after placing exactly the given number of squares, following the same
+    movement rules as path generation. Squares already on the path are not
+    taken into account, so a row missing from the mask means a branch ending
+    on it is dead, while a row in the mask means it *might* still succeed.
+    This covers both the distance check (a path can only climb one row per
+    square) and the parity check (narrow grids may only be able to end on the
+    top row after an even or odd number of squares), and is memoized per grid
+    size.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        remaining (int): Number of squares left to place.
+
+    Returns:
+        int: Bit ``y`` is set if row ``y`` can reach the top row.
+    """
+
+    if remaining < 0:
+        return 0
+
+    table = _REACHABILITY.get(grid_size)
+
+    if table is None or remaining >= len(table):
+        with _REACHABILITY_LOCK:
+            table = _extend_reachability(grid_size, remaining)
+
+    return table[remaining]
+
+
+def _extend_reachability(grid_size: int, remaining: int) -> list[int]:
+    """
+    Extends the reachability table for the given grid size up to the given
+    number of remaining squares. See :func:`_reachable_rows`.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        remaining (int): Number of squares left to place.
+
+    Returns:
+        list: The reachability table.
+    """
+
+    table = _REACHABILITY.setdefault(grid_size, [1])
+
+    if remaining >= len(table):
+        # Rows 1 through the second to last, where sideways moves are allowed
+        middle_rows = ((1 << grid_size) - 1) & ~1 & ~(1 << (grid_size - 1))
+        # Rows a square can move down from without landing on the bottom row
+        down_rows = middle_rows & ~(1 << (grid_size - 2)) if grid_size > 2 else 0
+        all_rows = (1 << grid_size) - 1
+
+        while remaining >= len(table):
+            previous = table[-1]
+            rows = previous << 1 | previous & middle_rows | (previous >> 1) & down_rows
+            # A path may never pass through the top row before its last square
+            table.append(rows & all_rows & ~1)
+
+    return table
+
+
+def _can_reach_top(grid_size: int, remaining: int, row: int) -> bool:
+    """
+    Returns whether a path whose last square is on the given row can end on
+    the top row after placing exactly the given number of squares. See
+    :func:`_reachable_rows`.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        remaining (int): Number of squares left to place.
+        row (int): Y coordinate of the last square on the path.
+
+    Returns:
+        bool
+    """
+
+    if not 0 <= row < grid_size:
+        return False
+
+    return bool(_reachable_rows(grid_size, remaining) >> row & 1)
+
+
+def _neighbour_masks(grid_size: int) -> tuple[tuple[int], tuple[int]]:
+    """
+    Returns the neighbour masks for the given grid size, computing and caching
+    them on first use.
+    Squares are numbered ``y * grid_size + x``. Masks cover a window of three
+    rows, starting with the row above a square, so they stay small no matter
+    how large the grid is. Shifting a mask left by ``(y - 1) * grid_size``
+    places it on the grid for a square on row ``y``.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+
+    Returns:
+        tuple: Neighbour masks indexed by X coordinate, and masks for every
+            combination of the three window rows, indexed by a 3-bit row mask.
+    """
+
+    masks = _NEIGHBOURS.get(grid_size)
+
+    if masks is None:
+        neighbours = []
+        for x in range(grid_size):
+            # Up and down
+            mask = 1 << x | 1 << (2 * grid_size + x)
+            # Left and right
+            if x > 0:
+                mask |= 1 << (grid_size + x - 1)
+            if x < grid_size - 1:
+                mask |= 1 << (grid_size + x + 1)
+            neighbours.append(mask)
+
+        row = (1 << grid_size) - 1
+        rows = []
+        for row_mask in range(8):
+            mask = 0
+            for i in range(3):
+                if row_mask >> i & 1:
+                    mask |= row << (i * grid_size)
+            rows.append(mask)
+
+        masks = (tuple(neighbours), tuple(rows))
+        _NEIGHBOURS[grid_size] = masks
+
+    return masks
+
+
+def _zobrist_table(grid_size: int) -> tuple[int]:
+    """
+    Returns the Zobrist table for the given grid size, computing and caching
+    it on first use. The table has a random 64-bit key for each step between
+    two adjacent squares, two per square: to the right and down. Keys are
+    drawn from a generator seeded with the grid size, so fingerprints are the
+    same on every run and can be stored.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+
+    Returns:
+        tuple: Keys indexed by ``2 * square``, plus 1 for steps down.
+    """
+
+    table = _ZOBRIST.get(grid_size)
+
+    if table is None:
+        rng = random.Random(f"zobrist:{grid_size}")
+        table = tuple(rng.getrandbits(64) for _ in range(2 * grid_size * grid_size))
+        _ZOBRIST[grid_size] = table
+
+    return table
+
+
+def path_hash(path, grid_size: int) -> int:
+    """
+    Returns a 64-bit fingerprint of a path, the XOR of the Zobrist keys of its
+    steps. A path never visits a square twice and starts on the bottom row,
+    so its steps alone determine it, and different paths get different
+    fingerprints except with negligible probability.
+
+    Arguments:
+        path: Sequence of (x, y) grid coordinates.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+
+    Returns:
+        int
+    """
+
+    table = _zobrist_table(grid_size)
+    result = 0
+
+    previous = None
+    for x, y in path:
+        square = y * grid_size + x
+        if previous is not None:
+            low = min(previous, square)
+            result ^= table[2 * low + (abs(previous - square) != 1)]
+        previous = square
+
+    return result
+
+
+def _typecode(largest: int) -> str:
+    """
+    Returns the smallest :mod:`array` type code able to store every value up
+    to the given one.
+
+    Arguments:
+        largest (int): Largest value to store.
+
+    Returns:
+        str
+    """
+
+    if largest <= 0xFF:
+        return "B"
+    if largest <= 0xFFFF:
+        return "H"
+    return "I"
+
+
+def square_typecode(grid_size: int) -> str:
+    """
+    Returns the :mod:`array` type code paths on the given grid size are
+    stored with, see :attr:`MemoryMazeGrid.squares`.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+
+    Returns:
+        str
+    """
+
+    return _typecode(grid_size * grid_size - 1)
+
+
+class PathView(Sequence):
+    """
+    Read-only view of a path stored as an array of square indices, which
+    turns squares back into (x, y) coordinates as they are read. Views
+    compare equal to any sequence of the same coordinates.
+
+    Arguments:
+        squares (:class:`~array.array`): Square indices of the path,
+            numbered ``y * grid_size + x``.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+    """
+
+    __slots__ = ("_squares", "_grid_size")
+
+    def __init__(self, squares: array, grid_size: int):
+        self._squares = squares
+        self._grid_size = grid_size
+
+    def __len__(self) -> int:
+        return len(self._squares)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [(square % self._grid_size, square // self._grid_size) for square in self._squares[index]]
+
+        square = self._squares[index]
+        return square % self._grid_size, square // self._grid_size
+
+    def __iter__(self):
+        grid_size = self._grid_size
+        for square in self._squares:
+            yield square % grid_size, square // grid_size
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, PathView):
+            return self._grid_size == other._grid_size and self._squares == other._squares
+
+        if not isinstance(other, (list, tuple)):
+            return NotImplemented
+
+        return len(other) == len(self) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"PathView({list(self)!r})"
+
+
+class _SearchLimitReached(Exception):
+    """
+    Raised when the path search runs out of nodes or time.
+    """
 
 
 class MemoryMazeGrid:
     """
     Class for encapsulating the state of the game grid and performing actions
     on it.
+
+    Arguments:
+        strategy (:class:`~PathStrategy`): Strategy used to generate paths
+            when none is given to :meth:`generate_path`.
+        parallel_attempts (int): Number of searches to race with the
+            :attr:`~PathStrategy.PARALLEL` strategy. None for one per CPU.
+        seed: Seed for generating paths. With a seed, each path is generated
+            from its own random number generator, seeded from this seed, the
+            grid size and the path length, so the same seed always gives the
+            same paths. The search deadline is ignored, as whether it's hit
+            depends on the machine, but the node budget still applies. Races
+            between parallel searches are not reproducible.
+        rng (:class:`~random.Random`): Random number generator used when there
+            is no seed. None for the :mod:`random` module's shared generator.
+        cache (:class:`~PathCache`): Cache for paths generated from a seed,
+            so they are only generated once. Unused without a seed.
+        seen_paths (:class:`~SeenPaths`): Fingerprints of paths already
+            seen. A generated path that was seen before is generated again,
+            up to :data:`MAX_REROLLS` times. Paths are added when set with
+            :meth:`set_path`, not when generated. Unused with a seed, as that
+            would make paths depend on what was seen.
     """
 
-    def __init__(self):
+    __slots__ = ("_strategy", "_parallel_attempts", "_seed", "_random", "_cache", "_seen_paths", "_path",
+        "_grid_size", "_current_index", "_path_strategy", "_index")
+
+    def __init__(self, strategy: PathStrategy = PathStrategy.BACKTRACK, parallel_attempts: int | None = None,
+            seed=None, rng: random.Random | None = None, cache: PathCache | None = None,
+            seen_paths: SeenPaths | None = None):
+        if strategy not in self._strategies:
+            raise ValueError("Unknown path strategy")
+
+        if parallel_attempts is not None and parallel_attempts <= 0:
+            raise ValueError("Parallel attempts must be positive")
+
+        self._strategy = strategy
+        self._parallel_attempts = parallel_attempts or os.cpu_count() or 1
+        self._seed = seed
+        self._random = rng or random
+        self._cache = cache
+        self._seen_paths = seen_paths
+        # Square indices of the path, see PathView
         self._path = None
         self._grid_size = 0
         self._current_index = 0
+        self._path_strategy = None
+        # Positions on the path, in order of their squares, see set_squares()
+        self._index = None
     
     @property
-    def path(self):
+    def path(self) -> PathView | None:
         """
-        Returns the current path.
+        Returns the current path, as a view of (x, y) coordinates. Returns
+        None if there is no path.
 
         Returns:
-            list
+            :class:`~PathView`
         """
         
+        if self._path is None:
+            return None
+
+        return PathView(self._path, self._grid_size)
+    
+    @property
+    def squares(self) -> array | None:
+        """
+        Returns the square indices of the current path, numbered
+        ``y * grid_size + x``. Returns None if there is no path. The array
+        must not be modified.
+
+        Returns:
+            :class:`~array.array`
+        """
+
         return self._path
     
+    @property
+    def grid_size(self) -> int:
+        """
+        Returns the size of one dimension of the grid the current path is on.
+
+        Returns:
+            int
+        """
+
+        return self._grid_size
+    
+    @property
+    def current_index(self) -> int:
+        """
+        Returns the number of squares of the current path selected so far.
+
+        Returns:
+            int
+        """
+
+        return self._current_index
+    
     @property
     def last_position(self) -> tuple[int]:
         """
@@ -35,22 +422,225 @@ class MemoryMazeGrid:
         if self._current_index == 0:
             return None
         
-        return self._path[self._current_index - 1]
+        square = self._path[self._current_index - 1]
+        return square % self._grid_size, square // self._grid_size
+    
+    @property
+    def strategy(self) -> PathStrategy:
+        """
+        Returns the strategy used to generate paths by default.
+
+        Returns:
+            :class:`~PathStrategy`
+        """
+
+        return self._strategy
+    
+    @property
+    def seed(self):
+        """
+        Returns the seed for generating paths, None if there is no seed.
+        """
+
+        return self._seed
+    
+    @property
+    def path_strategy(self) -> PathStrategy | None:
+        """
+        Returns the strategy that produced the current path. Returns None if
+        there is no path, or it wasn't generated, e.g. it came from a level
+        pack.
+
+        Returns:
+            :class:`~PathStrategy`
+        """
+
+        return self._path_strategy
+    
+    @classmethod
+    def register_strategy(cls, strategy, generator):
+        """
+        Registers a path generation strategy, replacing any generator already
+        registered for it.
+        The generator is called like a method, with the grid, path length,
+        grid size, node budget, deadline and the :class:`~random.Random` to
+        draw from, and must return a path as a list of coordinates, or None if
+        no path of that length is possible. It should honour the node budget
+        and deadline if it searches, by raising :class:`_SearchLimitReached`.
+
+        Arguments:
+            strategy: Key identifying the strategy, usually a
+                :class:`~PathStrategy`.
+            generator: Path generation function.
+        """
+
+        cls._strategies[strategy] = generator
     
-    def generate_path(self, path_length: int, grid_size: int) -> list[tuple[int]]:
+    def generate_path(self, path_length: int, grid_size: int, node_budget: int | None = None,
+            deadline: float | None = None, strategy: PathStrategy | None = None) -> list[tuple[int]]:
         """
-        Generates a path on the grid of the given length and grid size.
+        Generates a path on the grid of the given length and grid size, using
+        the given strategy, or the grid's default strategy if None. See
+        :meth:`create_path`.
 
         Arguments:
             path_length (int): Desired length of the path.
             grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            node_budget (int): Maximum number of squares the search may add
+                to the path, None for no limit.
+            deadline (float): :func:`time.monotonic` time by which the search
+                must finish, None for no limit.
+            strategy (:class:`~PathStrategy`): Strategy to use.
         """
 
-        self._path = self._generate_path(path_length, grid_size, [])
-        self._grid_size = grid_size
-        self._current_index = 0
+        path, path_strategy = self.create_path(path_length, grid_size, node_budget, deadline, strategy)
+        self.set_path(path, grid_size, path_strategy)
         return self.path
     
+    def create_path(self, path_length: int, grid_size: int, node_budget: int | None = None,
+            deadline: float | None = None, strategy: PathStrategy | None = None) -> tuple:
+        """
+        Creates a path of the given length and grid size, using the given
+        strategy, or the grid's default strategy if None, without changing
+        the grid. This is safe to call from another thread.
+        If a searching strategy expands more squares than the node budget
+        allows, or is still running at the deadline, the path is built by
+        :meth:`_construct_path` instead, which never backtracks.
+        If the grid has a seed, the path is taken from the cache if it's
+        there, and added to it otherwise. Without a seed, paths already seen
+        are rerolled, see the constructor.
+
+        Arguments:
+            path_length (int): Desired length of the path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            node_budget (int): Maximum number of squares the search may add
+                to the path, None for no limit.
+            deadline (float): :func:`time.monotonic` time by which the search
+                must finish, None for no limit.
+            strategy (:class:`~PathStrategy`): Strategy to use.
+
+        Returns:
+            tuple: The path (None if not possible) and the strategy that
+                produced it.
+        """
+
+        if strategy is None:
+            strategy = self._strategy
+
+        generator = self._strategies.get(strategy)
+        if generator is None:
+            raise ValueError("Unknown path strategy")
+
+        rng = self._random
+        if self._seed is not None:
+            if self._cache is not None:
+                cached = self._cache.get(self._seed, strategy, grid_size, path_length)
+                if cached is not None:
+                    return cached
+
+            rng = random.Random(f"{self._seed!r}:{grid_size}:{path_length}")
+            deadline = None
+
+        seen_paths = self._seen_paths if self._seed is None else None
+
+        for _ in range(MAX_REROLLS + 1 if seen_paths is not None else 1):
+            path_strategy = strategy
+            try:
+                path = generator(self, path_length, grid_size, node_budget, deadline, rng)
+            except _SearchLimitReached:
+                path = self._construct_path(path_length, grid_size, rng=rng)
+                path_strategy = PathStrategy.CONSTRUCTIVE
+
+            if path is None:
+                return None, None
+
+            # Only remembered once set, see set_path(), as it may never be shown
+            if seen_paths is None or path_hash(path, grid_size) not in seen_paths:
+                break
+
+        if self._seed is not None and self._cache is not None:
+            self._cache.put(self._seed, strategy, grid_size, path_length, path, path_strategy)
+
+        return path, path_strategy
+    
+    def set_path(self, path: list[tuple[int]] | None, grid_size: int,
+            path_strategy: PathStrategy | None = None):
+        """
+        Sets the path on the grid, for example one returned by
+        :meth:`create_path`, and clears any selection. The path is stored as
+        an array of square indices, taking a few bytes per square. Without a
+        seed, the path's fingerprint is added to the seen paths.
+
+        Arguments:
+            path (list): The path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            path_strategy (:class:`~PathStrategy`): Strategy that produced the
+                path.
+        """
+
+        if path is not None:
+            if self._seed is None and self._seen_paths is not None:
+                self._seen_paths.add(path_hash(path, grid_size))
+            path = [y * grid_size + x for x, y in path]
+
+        self.set_squares(path, grid_size, path_strategy)
+    
+    def set_squares(self, squares, grid_size: int, path_strategy: PathStrategy | None = None,
+            current_index: int = 0):
+        """
+        Sets the path on the grid from its square indices, numbered
+        ``y * grid_size + x``, for example from :attr:`squares`, with the given
+        number of squares already selected.
+
+        Arguments:
+            squares: Iterable of square indices, or None for no path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            path_strategy (:class:`~PathStrategy`): Strategy that produced the
+                path.
+            current_index (int): Number of squares already selected.
+
+        Raises:
+            ValueError: If the grid size isn't positive, the path is empty, a
+                square is outside the grid, or the current index is outside
+                the path.
+        """
+
+        if grid_size < 1:
+            raise ValueError("Grid size must be positive")
+
+        if squares is not None:
+            squares = array(square_typecode(grid_size), squares)
+
+            if not squares:
+                raise ValueError("Path is empty")
+
+            if any(square >= grid_size * grid_size for square in squares):
+                raise ValueError("Square is outside the grid")
+
+            # A complete path is replaced by the next level's, so the last
+            # square is never selected
+            if not 0 <= current_index < len(squares):
+                raise ValueError("Current index is outside the path")
+        elif current_index != 0:
+            raise ValueError("Current index is outside the path")
+
+        self._path_strategy = path_strategy
+        self._grid_size = grid_size
+        self._current_index = current_index
+        self._path = squares
+
+        if squares is None:
+            self._index = None
+            return
+
+        # The positions on the path, in order of their squares, so a square's
+        # position is found by binary search. The squares selected so far are
+        # those whose position is below the current index, so this tells
+        # whether a square was selected without keeping a separate set to
+        # clear on every mistake. It grows with the path, not the grid
+        positions = sorted(range(len(squares)), key=squares.__getitem__)
+        self._index = array(_typecode(len(squares)), positions)
+    
     def select(self, x: int, y: int) -> SelectResult | None:
         """
         Selects a grid coordinate and returns the result of that action.
@@ -74,7 +664,7 @@ class MemoryMazeGrid:
         if self._path is None:
             return None
 
-        if self._path[self._current_index] == (x, y):
+        if 0 <= x < self._grid_size and self._path[self._current_index] == y * self._grid_size + x:
             self._current_index += 1
             if self._current_index >= len(self._path):
                 return SelectResult.COMPLETE
@@ -93,7 +683,8 @@ class MemoryMazeGrid:
         Returns whether the given grid coordinates represent a valid move.
         In order to be valid, the grid coordinates *must* be adjacent to the
         previously selected square, and *not* a previously selected square.
-        Invalid moves are ignored.
+        Invalid moves are ignored. This takes time logarithmic in the path
+        length.
 
         Arguments:
             x (int): X grid coordinate.
@@ -106,42 +697,54 @@ class MemoryMazeGrid:
         result = self.last_position
 
         if result is None:
-            # We are on the first square, count any click on the bottom row
-            # We do not have access to grid size in this class, but the first
-            # square is guaranteed to have a Y coordinate of the bottom row
-            return y == self._path[0][1]
+            # We are on the first square, count any click on the bottom row,
+            # which is the row the path starts on
+            return y == self._path[0] // self._grid_size
         
-        # Do not count previously selected squares
-        if (x, y) in self._path[:self._current_index]:
+        if not (0 <= x < self._grid_size and 0 <= y < self._grid_size):
             return False
 
         # Check if square is adjacent
         px, py = result
-        
-        valid_moves = []
-        if px > 0:
-            valid_moves.append((px-1, py))
-        if px < self._grid_size - 1:
-            valid_moves.append((px+1, py))
-        if py > 0:
-            valid_moves.append((px, py-1))
-        if py < self._grid_size - 1:
-            valid_moves.append((px, py+1))
-        
-        return (x, y) in valid_moves
+        if abs(x - px) + abs(y - py) != 1:
+            return False
+
+        # Do not count previously selected squares
+        square = y * self._grid_size + x
+        i = bisect_left(self._index, square, key=self._path.__getitem__)
+        return not (i < len(self._index) and self._path[self._index[i]] == square
+            and self._index[i] < self._current_index)
     
-    def _generate_path(self, path_length: int, grid_size: int, current_path: list[tuple[int]]):
+    def _generate_path(self, path_length: int, grid_size: int, node_budget: int | None = None,
+            deadline: float | None = None, rng: random.Random = random,
+            cancelled=None) -> list[tuple[int]] | None:
         """
-        Recursively generates a path of the given length and grid size.
+        Generates a path of the given length and grid size using a randomized
+        depth-first search. The search keeps a single path and a bitmask of
+        the squares on it, both updated in place as it steps forward and
+        backtracks, with an explicit stack holding a bitmask of the moves left
+        to try from each square on the path, so path length is not bound by
+        the recursion limit. See :func:`_neighbour_masks` for how squares are
+        numbered.
 
         Arguments:
             path_length (int): Desired length of the path.
             grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
-            current_path (list): The current generated path.
+            node_budget (int): Maximum number of squares the search may add
+                to the path, None for no limit.
+            deadline (float): :func:`time.monotonic` time by which the search
+                must finish, None for no limit.
+            rng (:class:`~random.Random`): Random number generator to use.
+            cancelled: Function returning whether the search should stop
+                early, checked along with the deadline. None to never stop.
         
         Returns:
             list or None: list of successful path generation, None if path of
-                given length not possible from current position.
+                given length not possible.
+
+        Raises:
+            _SearchLimitReached: If the node budget or deadline is exceeded,
+                or the search is cancelled.
         """
 
         if path_length <= 0:
@@ -150,51 +753,202 @@ class MemoryMazeGrid:
         if grid_size <= 0:
             raise ValueError("Grid size must be positive")
 
-        # If we have generated a path of the desired length
-        if len(current_path) == path_length:
-            # If we are at the top
-            if current_path[-1][1] == 0:
-                # Success! Return the path
-                return current_path
-            else:
-                # Not at the top, invalid path
-                return None
-        
-        # If we are at the top and the path is too short
-        if len(current_path) > 0 and current_path[-1][1] == 0:
-            # Invalid path
+        # Give up straight away if no path of this length can exist
+        if not _can_reach_top(grid_size, path_length - 1, grid_size - 1):
             return None
 
-        # If we are placing starter piece
-        if len(current_path) == 0:
-            # Choose random X
-            x = random.randint(0, grid_size - 1)
-            # Start at bottom
-            y = grid_size - 1
+        neighbours, rows = _neighbour_masks(grid_size)
+        window = rows[0b111]
+        # Only the first square may be on the bottom row
+        not_bottom = ~(1 << (grid_size - 1))
 
-            current_path = [(x, y)]
-        
-        x, y = current_path[-1]
-
-        # Up is always an option
-        options = [(x, y-1)]
-        # Left if not on left or bottom edge
-        # Do not want more than one step on the bottom
-        if x > 0 and y < grid_size - 1:
-            options.append((x-1, y))
-        # Right if not on right or bottom edge
-        # Do not want more than one step on the bottom
-        if x < grid_size - 1 and y < grid_size - 1:
-            options.append((x+1, y))
-        if y < grid_size - 1:
-            options.append((x, y+1))
-        
-        random.shuffle(options)
+        # Choose random X, start at bottom
+        start = (grid_size - 1) * grid_size + rng.randint(0, grid_size - 1)
+
+        path = [start]
+        visited = 1 << start
+        stack = []
+        nodes = 0
+
+        # The reachability check guarantees that the last square is on the
+        # top row, and no square before it is, once the path is long enough
+        while len(path) < path_length:
+            if len(stack) < len(path):
+                # Find the moves from the newest square, as a mask over the
+                # three rows around it. Leave out visited squares and rows
+                # from which the top can't be reached in time.
+                y, x = divmod(path[-1], grid_size)
+                base = (y - 1) * grid_size
+                reachable = _reachable_rows(grid_size, path_length - len(path) - 1) & not_bottom
+                stack.append(neighbours[x] & rows[reachable >> (y - 1) & 0b111] & ~(visited >> base & window))
 
-        for option in options:
-            if option not in current_path:
-                path = self._generate_path(path_length, grid_size, current_path + [option])
-                if path is not None:
-                    return path
+            options = stack[-1]
+
+            if not options:
+                # Dead end, backtrack
+                stack.pop()
+                visited ^= 1 << path.pop()
+
+                if not path:
+                    return None
+
+                continue
+
+            # Pick a random move and remove it from the moves left to try
+            option = options
+            for _ in range(rng.randrange(options.bit_count())):
+                option &= option - 1
+            option &= -option
+            stack[-1] = options ^ option
+
+            square = (path[-1] // grid_size - 1) * grid_size + option.bit_length() - 1
+            path.append(square)
+            visited |= 1 << square
+
+            nodes += 1
+            if node_budget is not None and nodes > node_budget:
+                raise _SearchLimitReached()
+            # Only check the clock every so often, it costs more than a step
+            if nodes % 256 == 0:
+                if deadline is not None and time.monotonic() > deadline:
+                    raise _SearchLimitReached()
+                if cancelled is not None and cancelled():
+                    raise _SearchLimitReached()
         
-        return None
+        return [(square % grid_size, square // grid_size) for square in path]
+
+    def _construct_path(self, path_length: int, grid_size: int, node_budget: int | None = None,
+            deadline: float | None = None, rng: random.Random = random) -> list[tuple[int]] | None:
+        """
+        Builds a path of the given length and grid size directly, in time
+        linear in the path length, with no backtracking. The path never moves
+        down, so it can't run into itself: it climbs one row at a time, moving
+        sideways for a random number of squares on each row in between the
+        bottom and top rows. This succeeds for every path length from the grid
+        size up to the grid size plus one full row for each of those rows,
+        which includes every path the game asks for.
+
+        Arguments:
+            path_length (int): Desired length of the path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            node_budget (int): Unused, the construction never searches.
+            deadline (float): Unused, the construction never searches.
+            rng (:class:`~random.Random`): Random number generator to use.
+
+        Returns:
+            list or None: The path, None if a path of the given length can't
+                be built this way.
+        """
+
+        if path_length <= 0:
+            raise ValueError("Path length must be positive")
+
+        if grid_size <= 0:
+            raise ValueError("Grid size must be positive")
+
+        if grid_size == 1:
+            return [(0, 0)] if path_length == 1 else None
+
+        rows_left = grid_size - 2
+        # Squares to place on top of a straight line up
+        extra = path_length - grid_size
+
+        if extra < 0 or extra > rows_left * (grid_size - 1):
+            return None
+
+        # From any column there is room for a run of half the grid width in
+        # one direction or the other. If that isn't enough, run from edge to
+        # edge on as many rows as needed instead.
+        half = grid_size // 2
+        edge_to_edge = extra > rows_left * half
+
+        if edge_to_edge:
+            x = rng.choice((0, grid_size - 1))
+        else:
+            x = rng.randint(0, grid_size - 1)
+
+        path = [(x, grid_size - 1)]
+
+        for y in range(grid_size - 2, 0, -1):
+            path.append((x, y))
+            rows_left -= 1
+            left, right = x, grid_size - 1 - x
+
+            if edge_to_edge:
+                direction = -1 if left > right else 1
+                run = min(extra, max(left, right))
+            else:
+                # Leave no more than the rows above can fit
+                shortest = max(0, extra - rows_left * half)
+                directions = [d for d, room in ((-1, left), (1, right)) if min(extra, room) >= shortest]
+                direction = rng.choice(directions)
+                run = rng.randint(shortest, min(extra, left if direction < 0 else right))
+
+            for _ in range(run):
+                x += direction
+                path.append((x, y))
+            
+            extra -= run
+
+        path.append((x, 0))
+        return path
+
+    def _sample_path(self, path_length: int, grid_size: int, node_budget: int | None = None,
+            deadline: float | None = None, rng: random.Random = random) -> list[tuple[int]] | None:
+        """
+        Draws a path of the given length and grid size uniformly at random
+        from all the paths that never move down. See
+        :mod:`memorymaze.sampler`.
+
+        Arguments:
+            path_length (int): Desired length of the path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            node_budget (int): Unused, sampling never searches.
+            deadline (float): Unused, sampling never searches.
+            rng (:class:`~random.Random`): Random number generator to use.
+
+        Returns:
+            list or None: The path, None if a path of the given length can't
+                be built without moving down.
+        """
+
+        return sample_path(path_length, grid_size, rng)
+
+    def _race_path(self, path_length: int, grid_size: int, node_budget: int | None = None,
+            deadline: float | None = None, rng: random.Random = random) -> list[tuple[int]] | None:
+        """
+        Races independently seeded searches for a path of the given length and
+        grid size on a process pool, returning the first path found. See
+        :mod:`memorymaze.parallel`.
+
+        Arguments:
+            path_length (int): Desired length of the path.
+            grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+            node_budget (int): Maximum number of squares each search may add
+                to the path, None for no limit.
+            deadline (float): :func:`time.monotonic` time by which the searches
+                must finish, None for no limit.
+            rng (:class:`~random.Random`): Random number generator to seed the
+                searches from.
+
+        Returns:
+            list or None: list of successful path generation, None if path of
+                given length not possible.
+
+        Raises:
+            _SearchLimitReached: If every search that didn't rule the path out
+                ran out of budget.
+        """
+
+        # Imported here, as the parallel module imports this one
+        from memorymaze.parallel import race_path
+
+        return race_path(path_length, grid_size, self._parallel_attempts, node_budget, deadline, rng)
+
+    # Path generators, keyed by strategy. See register_strategy().
+    _strategies = {
+        PathStrategy.BACKTRACK: _generate_path,
+        PathStrategy.CONSTRUCTIVE: _construct_path,
+        PathStrategy.UNIFORM: _sample_path,
+        PathStrategy.PARALLEL: _race_path,
+    }
@@ -0,0 +1,195 @@
+"""
+Module for precomputed level packs: files holding the path for each level, so
+the game doesn't have to generate paths at all.
+A level pack is a little-endian binary file made up of:
+
+- A header: the magic bytes ``MMLP``, the format version (uint16) and the
+  number of levels (uint16).
+- An index entry for each level, in order from level 1: the offset of the
+  level's path in the file (uint32), the grid size (uint16) and the path
+  length (uint16).
+- The path of each level, as square indices (uint16, ``y * grid_size + x``).
+
+Packs are read through :mod:`mmap`, so opening one is instant and only the
+pages for the levels actually played are read from disk.
+
+Build a pack with ``python -m memorymaze.levelpack FILE LEVELS``.
+"""
+
+import argparse
+import mmap
+import struct
+import sys
+
+from array import array
+
+from memorymaze.gamestate import GameState
+from memorymaze.grid import MemoryMazeGrid
+from memorymaze.grid import SEARCH_NODE_BUDGET
+from memorymaze.strategy import PathStrategy
+
+MAGIC = b"MMLP"
+
+# Version of the level pack file format.
+FILE_VERSION = 1
+
+_HEADER = struct.Struct("<4sHH")
+_INDEX_ENTRY = struct.Struct("<IHH")
+
+# Square indices are stored as uint16, which limits the grid size.
+MAX_GRID_SIZE = 256
+
+
+class LevelPack:
+    """
+    Level pack file opened for reading.
+
+    Arguments:
+        file (str): Path where the level pack is stored.
+    """
+
+    def __init__(self, file: str):
+        with open(file, "rb") as f:
+            size = f.seek(0, 2)
+            if size < _HEADER.size:
+                raise ValueError("Not a level pack")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self._levels = _HEADER.unpack_from(self._mmap)
+
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError("Not a level pack")
+
+        if version != FILE_VERSION:
+            self._mmap.close()
+            raise ValueError("Unsupported level pack version")
+
+        if size < _HEADER.size + self._levels * _INDEX_ENTRY.size:
+            self._mmap.close()
+            raise ValueError("Level pack is truncated")
+
+    def __len__(self) -> int:
+        return self._levels
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def level(self, level: int) -> tuple | None:
+        """
+        Reads the grid size and path of the given level. Returns None if the
+        pack doesn't have that level.
+
+        Arguments:
+            level (int): The level, starting from 1.
+
+        Returns:
+            tuple: The grid size and the path.
+
+        Raises:
+            ValueError: If the level's entry or path is corrupt.
+        """
+
+        if not 1 <= level <= self._levels:
+            return None
+
+        offset, grid_size, path_length = _INDEX_ENTRY.unpack_from(self._mmap,
+            _HEADER.size + (level - 1) * _INDEX_ENTRY.size)
+
+        squares = array("H")
+        end = offset + path_length * squares.itemsize
+        if offset < _HEADER.size + self._levels * _INDEX_ENTRY.size or end > len(self._mmap):
+            raise ValueError(f"Level {level} is outside the level pack")
+
+        if not 0 < grid_size <= MAX_GRID_SIZE:
+            raise ValueError(f"Level {level} has an invalid grid size")
+
+        squares.frombytes(self._mmap[offset:end])
+        if sys.byteorder != "little":
+            squares.byteswap()
+
+        if squares and max(squares) >= grid_size * grid_size:
+            raise ValueError(f"Level {level} has a square outside the grid")
+
+        return grid_size, [(square % grid_size, square // grid_size) for square in squares]
+
+    def close(self):
+        """
+        Closes the level pack.
+        """
+
+        self._mmap.close()
+
+
+def build_level_pack(file: str, levels: int, strategy: PathStrategy = PathStrategy.BACKTRACK, seed=None):
+    """
+    Generates the paths for levels 1 to the given level and writes them to a
+    level pack. Grid sizes and path lengths come from :class:`~GameState`.
+
+    Arguments:
+        file (str): Path where the level pack should be written.
+        levels (int): Number of levels.
+        strategy (:class:`~PathStrategy`): Strategy used to generate the
+            paths.
+        seed: Seed for generating the paths, None for random paths.
+    """
+
+    if not 0 < levels < 1 << 16:
+        raise ValueError("Number of levels must be between 1 and 65535")
+
+    game_state = GameState()
+    grid = MemoryMazeGrid(strategy, seed=seed)
+
+    index = bytearray()
+    paths = array("H")
+    offset = _HEADER.size + levels * _INDEX_ENTRY.size
+
+    for level in range(1, levels + 1):
+        grid_size = game_state.grid_size_at(level)
+        path_length = game_state.path_size_at(level)
+
+        if grid_size > MAX_GRID_SIZE:
+            raise ValueError(f"Grid size of level {level} is too large for a level pack")
+
+        # No deadline, so that a seed always gives the same pack
+        path, _ = grid.create_path(path_length, grid_size, SEARCH_NODE_BUDGET)
+        if path is None:
+            raise ValueError(f"Could not generate a path for level {level}")
+
+        index += _INDEX_ENTRY.pack(offset + len(paths) * paths.itemsize, grid_size, path_length)
+        paths.extend(y * grid_size + x for x, y in path)
+
+    if sys.byteorder != "little":
+        paths.byteswap()
+
+    with open(file, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, FILE_VERSION, levels))
+        f.write(index)
+        f.write(paths.tobytes())
+
+
+def main(args: list[str] | None = None):
+    """
+    Command line entry point for building a level pack.
+
+    Arguments:
+        args (list): Command line arguments, None for :data:`sys.argv`.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m memorymaze.levelpack",
+        description="Pre-generate the paths for levels 1 to LEVELS into a level pack.")
+    parser.add_argument("file", help="level pack file to write")
+    parser.add_argument("levels", type=int, help="number of levels")
+    parser.add_argument("--strategy", choices=[strategy.value for strategy in PathStrategy],
+        default=PathStrategy.BACKTRACK.value, help="path generation strategy")
+    parser.add_argument("--seed", help="seed for generating the paths")
+    args = parser.parse_args(args)
+
+    build_level_pack(args.file, args.levels, PathStrategy(args.strategy), args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Module for measuring the difficulty of generated paths in bulk, to check that
+difficulty is consistent within and across levels.
+Paths are packed into 2-D arrays of square indices, one row per path, and
+every metric is computed on whole arrays with NumPy, so hundreds of thousands
+of paths take seconds. NumPy is only needed for this module, and is imported
+when first used.
+
+Run with ``python -m memorymaze.metrics``.
+"""
+
+import argparse
+import json
+import random
+
+from memorymaze.gamestate import GameState
+from memorymaze.gamestate import PATH_STRATEGY
+from memorymaze.grid import MemoryMazeGrid
+from memorymaze.grid import SEARCH_NODE_BUDGET
+from memorymaze.strategy import PathStrategy
+
+# Number of paths to generate for each level by default.
+DEFAULT_SAMPLES = 10000
+
+# Percentiles reported by summarize().
+PERCENTILES = (10, 50, 90)
+
+
+def _numpy():
+    """
+    Returns the NumPy module.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError("Path metrics need NumPy, install it with: pip install numpy") from e
+
+    return numpy
+
+
+def pack_paths(paths, grid_size: int):
+    """
+    Packs paths of the same length into a 2-D array of square indices,
+    numbered ``y * grid_size + x``, one row per path.
+
+    Arguments:
+        paths: Sequence of paths, each a sequence of (x, y) grid coordinates.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+
+    Returns:
+        :class:`numpy.ndarray`
+    """
+
+    np = _numpy()
+
+    if len({len(path) for path in paths}) > 1:
+        raise ValueError("Paths must all have the same length")
+
+    return np.array([[y * grid_size + x for x, y in path] for path in paths], dtype=np.int32)
+
+
+def generate_paths(path_length: int, grid_size: int, count: int, strategy: PathStrategy = PATH_STRATEGY,
+        seed=None):
+    """
+    Generates paths with :class:`~MemoryMazeGrid` and packs them into a 2-D
+    array of square indices, one row per path. The search is limited by the
+    game's node budget, but not by time, so a seed gives the same paths on
+    every machine.
+
+    Arguments:
+        path_length (int): Length of the paths.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        count (int): Number of paths.
+        strategy (:class:`~PathStrategy`): Strategy used to generate the
+            paths.
+        seed: Seed for generating the paths, None for random paths.
+
+    Returns:
+        :class:`numpy.ndarray`
+    """
+
+    np = _numpy()
+
+    # One generator for the whole batch, as a seeded grid would give the
+    # same path every time
+    grid = MemoryMazeGrid(strategy, rng=random.Random(seed))
+    squares = np.empty((count, path_length), dtype=np.int32)
+
+    for i in range(count):
+        path, _ = grid.create_path(path_length, grid_size, SEARCH_NODE_BUDGET)
+        if path is None:
+            raise ValueError("No path of that length is possible")
+        squares[i] = [y * grid_size + x for x, y in path]
+
+    return squares
+
+
+def path_metrics(squares, grid_size: int) -> dict:
+    """
+    Computes difficulty metrics for each path in a 2-D array of square
+    indices, as returned by :func:`pack_paths` or :func:`generate_paths`.
+
+    Arguments:
+        squares: 2-D array of square indices, one row per path.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+
+    Returns:
+        dict: Array of each metric, one value per path, by name:
+
+            - ``turns``: Changes of direction.
+            - ``down_moves``: Steps down.
+            - ``horizontal_runs``: Runs of consecutive sideways steps.
+            - ``max_horizontal_run``: Longest run of sideways steps.
+            - ``mean_horizontal_run``: Average length of the sideways runs,
+              0 if there are none.
+            - ``width`` and ``height``: Size of the bounding box, in squares.
+    """
+
+    np = _numpy()
+
+    squares = np.asarray(squares)
+    if squares.ndim != 2:
+        raise ValueError("Paths must be a 2-D array")
+
+    count, length = squares.shape
+    x = squares % grid_size
+    y = squares // grid_size
+    dx = np.diff(x, axis=1)
+    dy = np.diff(y, axis=1)
+
+    # Direction of each step: 0 up, 1 down, 2 left, 3 right
+    direction = np.select([dy < 0, dy > 0, dx < 0], [0, 1, 2], 3)
+    turns = np.count_nonzero(direction[:, 1:] != direction[:, :-1], axis=1)
+
+    # Mark sideways steps, with a step that isn't on each side of every row,
+    # so that runs found in the flattened array never cross rows. A run
+    # starts where the marks go from 0 to 1, and ends where they go back.
+    horizontal = dx != 0
+    padded = np.zeros((count, length + 1), dtype=np.int8)
+    padded[:, 1:-1] = horizontal
+    edges = np.diff(padded.ravel())
+    starts = np.flatnonzero(edges == 1) + 1
+    ends = np.flatnonzero(edges == -1) + 1
+    rows = starts // (length + 1)
+
+    horizontal_runs = np.bincount(rows, minlength=count)
+    max_horizontal_run = np.zeros(count, dtype=np.int64)
+    np.maximum.at(max_horizontal_run, rows, ends - starts)
+    mean_horizontal_run = np.divide(np.count_nonzero(horizontal, axis=1), horizontal_runs,
+        out=np.zeros(count), where=horizontal_runs > 0)
+
+    return {
+        "turns": turns,
+        "down_moves": np.count_nonzero(dy > 0, axis=1),
+        "horizontal_runs": horizontal_runs,
+        "max_horizontal_run": max_horizontal_run,
+        "mean_horizontal_run": mean_horizontal_run,
+        "width": x.max(axis=1) - x.min(axis=1) + 1,
+        "height": y.max(axis=1) - y.min(axis=1) + 1,
+    }
+
+
+def summarize(metrics: dict) -> dict:
+    """
+    Summarizes each metric returned by :func:`path_metrics` over all the
+    paths.
+
+    Arguments:
+        metrics (dict): Metrics to summarize.
+
+    Returns:
+        dict: Mean, standard deviation, minimum, maximum and
+            :data:`PERCENTILES` of each metric, by name.
+    """
+
+    np = _numpy()
+    summary = {}
+
+    for name, values in metrics.items():
+        stats = {
+            "mean": float(np.mean(values)),
+            "std": float(np.std(values)),
+            "min": float(np.min(values)),
+            "max": float(np.max(values)),
+        }
+        for percentile, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+            stats[f"p{percentile}"] = float(value)
+        summary[name] = stats
+
+    return summary
+
+
+def analyze(levels: int, samples: int = DEFAULT_SAMPLES, strategy: PathStrategy = PATH_STRATEGY,
+        seed=None) -> dict:
+    """
+    Generates paths for levels 1 to the given level, with sizes from
+    :class:`~GameState`, and summarizes their metrics.
+
+    Arguments:
+        levels (int): Number of levels.
+        samples (int): Number of paths to generate for each level.
+        strategy (:class:`~PathStrategy`): Strategy used to generate the
+            paths.
+        seed: Seed for generating the paths, None for random paths.
+
+    Returns:
+        dict: Summary of each level, see :func:`summarize`, by level.
+    """
+
+    game_state = GameState()
+    results = {}
+
+    for level in range(1, levels + 1):
+        grid_size = game_state.grid_size_at(level)
+        level_seed = None if seed is None else f"{seed!r}:{level}"
+        squares = generate_paths(game_state.path_size_at(level), grid_size, samples, strategy, level_seed)
+        results[level] = summarize(path_metrics(squares, grid_size))
+
+    return results
+
+
+def main(args: list[str] | None = None):
+    """
+    Command line entry point for analyzing path difficulty by level.
+
+    Arguments:
+        args (list): Command line arguments, None for :data:`sys.argv`.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m memorymaze.metrics",
+        description="Measure the difficulty of generated paths for each level.")
+    parser.add_argument("levels", type=int, help="number of levels")
+    parser.add_argument("--samples", type=int, default=DEFAULT_SAMPLES, help="paths to generate for each level")
+    parser.add_argument("--strategy", choices=[strategy.value for strategy in PathStrategy],
+        default=PATH_STRATEGY.value, help="path generation strategy")
+    parser.add_argument("--seed", help="seed for generating the paths")
+    parser.add_argument("--output", help="file to write the results to as JSON")
+    args = parser.parse_args(args)
+
+    results = analyze(args.levels, args.samples, PathStrategy(args.strategy), args.seed)
+
+    for level, summary in results.items():
+        print(f"level {level}: " + ", ".join(f"{name} {stats['mean']:.2f} ± {stats['std']:.2f}"
+            for name, stats in summary.items()))
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
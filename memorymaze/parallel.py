@@ -0,0 +1,159 @@
+"""
+Module for racing independently seeded path searches on a process pool.
+The time a randomized search takes is heavy-tailed: most runs finish quickly,
+but an unlucky one can take far longer than the median. Racing several of them
+and keeping the first path found cuts that tail down to roughly the best of
+them, given a core for each.
+"""
+
+import multiprocessing
+import random
+import threading
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import as_completed
+from concurrent.futures import wait
+
+from memorymaze.grid import MemoryMazeGrid
+from memorymaze.grid import _SearchLimitReached
+
+# Process pool shared by all races, created on first use and recreated if a
+# race needs a different number of workers.
+_pool = None
+_pool_workers = 0
+
+# Set to tell the searches still running in the pool to stop. Workers inherit
+# it when they start, as events can't be sent to a running process.
+_cancel_event = None
+
+# Only one race runs at a time, so the cancel event isn't shared between races.
+_race_lock = threading.Lock()
+
+# Cancel event in worker processes.
+_worker_cancel_event = None
+
+
+def _init_worker(cancel_event):
+    """
+    Initializes a worker process.
+
+    Arguments:
+        cancel_event: Event set when the searches should stop.
+    """
+
+    global _worker_cancel_event
+    _worker_cancel_event = cancel_event
+
+
+def _search(path_length: int, grid_size: int, seed: int, node_budget: int | None,
+        deadline: float | None) -> list[tuple[int]] | None:
+    """
+    Runs one seeded search in a worker process.
+
+    Arguments:
+        path_length (int): Desired length of the path.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        seed (int): Seed for the search.
+        node_budget (int): Maximum number of squares the search may add to the
+            path, None for no limit.
+        deadline (float): :func:`time.monotonic` time by which the search must
+            finish, None for no limit.
+
+    Returns:
+        list or None: list of successful path generation, None if path of
+            given length not possible.
+    """
+
+    return MemoryMazeGrid()._generate_path(path_length, grid_size, node_budget, deadline, random.Random(seed),
+        _worker_cancel_event.is_set)
+
+
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    """
+    Returns the shared process pool, creating it if needed.
+
+    Arguments:
+        workers (int): Number of worker processes.
+
+    Returns:
+        :class:`~ProcessPoolExecutor`
+    """
+
+    global _pool, _pool_workers, _cancel_event
+
+    if _pool is None or _pool_workers != workers:
+        if _pool is not None:
+            _pool.shutdown()
+
+        _cancel_event = multiprocessing.Event()
+        _pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(_cancel_event,))
+        _pool_workers = workers
+
+    return _pool
+
+
+def race_path(path_length: int, grid_size: int, attempts: int, node_budget: int | None = None,
+        deadline: float | None = None, rng: random.Random = random) -> list[tuple[int]] | None:
+    """
+    Races the given number of independently seeded searches for a path of the
+    given length and grid size, one per worker process. The first path found is
+    returned, and the other searches are cancelled.
+    Each search picks its own starting square, so one search failing doesn't
+    mean the others will.
+
+    Arguments:
+        path_length (int): Desired length of the path.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        attempts (int): Number of searches to race.
+        node_budget (int): Maximum number of squares each search may add to
+            the path, None for no limit.
+        deadline (float): :func:`time.monotonic` time by which the searches
+            must finish, None for no limit.
+        rng (:class:`~random.Random`): Random number generator to seed the
+            searches from.
+
+    Returns:
+        list or None: list of successful path generation, None if path of
+            given length not possible.
+
+    Raises:
+        _SearchLimitReached: If every search that didn't rule the path out ran
+            out of budget.
+    """
+
+    if path_length <= 0:
+        raise ValueError("Path length must be positive")
+
+    if grid_size <= 0:
+        raise ValueError("Grid size must be positive")
+
+    with _race_lock:
+        pool = _get_pool(attempts)
+        _cancel_event.clear()
+
+        futures = [pool.submit(_search, path_length, grid_size, rng.getrandbits(64), node_budget, deadline)
+            for _ in range(attempts)]
+
+        limit_reached = False
+        try:
+            for future in as_completed(futures):
+                try:
+                    path = future.result()
+                except _SearchLimitReached:
+                    limit_reached = True
+                    continue
+
+                if path is not None:
+                    return path
+        finally:
+            # Stop the other searches, and wait for them so they are done with
+            # the cancel event before the next race clears it
+            _cancel_event.set()
+            for future in futures:
+                future.cancel()
+            wait(futures)
+
+    if limit_reached:
+        raise _SearchLimitReached()
+
+    return None
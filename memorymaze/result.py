@@ -1,5 +1,9 @@
 from enum import Enum
 
+# Value recorded by MemoryMaze.select_many() for selects that did nothing,
+# where MemoryMaze.select() would return None.
+NO_RESULT = -2
+
 class SelectResult(Enum):
     """
     Enum responsible for communicating the state of the grid after the user
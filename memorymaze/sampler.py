@@ -0,0 +1,306 @@
+"""
+Module for drawing paths uniformly at random, using tables counting every
+possible path.
+Only paths that never move down are counted, so that counting is exact and
+cheap: with downward moves allowed, whether a square is free depends on the
+whole path so far, and counting becomes exponential. Paths follow the same
+rules as the other strategies otherwise: one square on the bottom row, ending
+on the top row, with no square visited twice.
+"""
+
+import json
+import os
+import random
+import threading
+
+from collections import OrderedDict
+
+from memorymaze.util import write_file_atomic
+
+# Directory to store count tables in, so they survive restarts. None keeps
+# them in memory only.
+CACHE_DIR = None
+
+# How many count tables to keep in memory.
+MAX_CACHED_TABLES = 16
+
+# Version of the count table file format.
+FILE_VERSION = 1
+
+# In-memory count tables, keyed by grid size and path length, least recently
+# used first.
+_CACHE = OrderedDict()
+
+# Guards the in-memory cache, as paths may be sampled on several threads at
+# once.
+_CACHE_LOCK = threading.Lock()
+
+
+class PathCounts:
+    """
+    Tables counting the paths of one grid size and path length, used to draw
+    paths uniformly at random.
+    Counts are kept for each square, number of squares left to place after it
+    and the way it was entered: moving up (or starting), moving left or moving
+    right. A square entered sideways can't be left in the opposite direction,
+    which is what keeps paths from running into themselves.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        path_length (int): Length of the paths.
+        tables (tuple): Previously built up, left and right tables, or None to
+            build them.
+    """
+
+    def __init__(self, grid_size: int, path_length: int, tables: tuple[list] | None = None):
+        if path_length <= 0:
+            raise ValueError("Path length must be positive")
+
+        if grid_size <= 0:
+            raise ValueError("Grid size must be positive")
+
+        self._grid_size = grid_size
+        self._path_length = path_length
+
+        if tables is None:
+            tables = self._build()
+
+        self._up, self._left, self._right = tables
+
+    @property
+    def grid_size(self) -> int:
+        """
+        Returns the grid size.
+
+        Returns:
+            int
+        """
+
+        return self._grid_size
+
+    @property
+    def path_length(self) -> int:
+        """
+        Returns the path length.
+
+        Returns:
+            int
+        """
+
+        return self._path_length
+
+    @property
+    def total(self) -> int:
+        """
+        Returns the number of possible paths.
+
+        Returns:
+            int
+        """
+
+        bottom = (self._grid_size - 1) * self._grid_size
+        return sum(self._up[self._path_length - 1][bottom:])
+
+    def sample(self, rng: random.Random = random) -> list[tuple[int]] | None:
+        """
+        Draws a path uniformly at random from all the possible paths, in time
+        linear in the path length.
+
+        Arguments:
+            rng (:class:`~random.Random`): Random number generator to use.
+
+        Returns:
+            list or None: The path, None if there are no possible paths.
+        """
+
+        grid_size = self._grid_size
+        remaining = self._path_length - 1
+        bottom = (grid_size - 1) * grid_size
+
+        # Choose the starting column, weighted by the paths from each one
+        counts = self._up[remaining]
+        total = sum(counts[bottom:])
+        if total == 0:
+            return None
+
+        pick = rng.randrange(total)
+        square = bottom
+        while pick >= counts[square]:
+            pick -= counts[square]
+            square += 1
+
+        path = [square]
+        table = self._up
+
+        # At each square, choose the next move weighted by the paths that
+        # continue with it. Moves are tried in a fixed order: up, left, right.
+        while remaining > 0:
+            pick = rng.randrange(table[remaining][square])
+            remaining -= 1
+            y, x = divmod(square, grid_size)
+
+            moves = [(self._up, square - grid_size)]
+            if 0 < y < grid_size - 1:
+                if x > 0 and table is not self._right:
+                    moves.append((self._left, square - 1))
+                if x < grid_size - 1 and table is not self._left:
+                    moves.append((self._right, square + 1))
+
+            for table, square in moves:
+                count = table[remaining][square]
+                if pick < count:
+                    break
+                pick -= count
+
+            path.append(square)
+
+        return [(square % grid_size, square // grid_size) for square in path]
+
+    def to_json(self) -> dict:
+        """
+        Returns the tables as a JSON-serializable dictionary.
+
+        Returns:
+            dict
+        """
+
+        return {
+            "version": FILE_VERSION,
+            "gridSize": self._grid_size,
+            "pathLength": self._path_length,
+            "up": self._up,
+            "left": self._left,
+            "right": self._right,
+        }
+
+    @staticmethod
+    def from_json(data: dict):
+        """
+        Constructs a :class:`~PathCounts` object from a dictionary returned by
+        :meth:`to_json`.
+
+        Arguments:
+            data (dict): Dictionary to read.
+
+        Returns:
+            PathCounts
+        """
+
+        if data["version"] != FILE_VERSION:
+            raise ValueError("Unsupported count table version")
+
+        return PathCounts(data["gridSize"], data["pathLength"], (data["up"], data["left"], data["right"]))
+
+    def _build(self) -> tuple[list]:
+        """
+        Builds the count tables, in time proportional to the number of squares
+        times the path length.
+
+        Returns:
+            tuple: Up, left and right tables. Entry ``[r][y * grid_size + x]``
+                is the number of ways to finish a path from square (x, y),
+                entered that way, with ``r`` more squares to place.
+        """
+
+        grid_size = self._grid_size
+        squares = grid_size * grid_size
+
+        # A path ends on the top row once there are no squares left to place
+        up = [[1] * grid_size + [0] * (squares - grid_size)]
+        left = [[0] * squares]
+        right = [[0] * squares]
+
+        for remaining in range(1, self._path_length):
+            previous_up, previous_left, previous_right = up[-1], left[-1], right[-1]
+            current_up, current_left, current_right = [0] * squares, [0] * squares, [0] * squares
+
+            for square in range(grid_size, squares):
+                x = square % grid_size
+                above = previous_up[square - grid_size]
+
+                # Sideways moves are only allowed between the top and bottom
+                # rows
+                if square < squares - grid_size:
+                    to_left = previous_left[square - 1] if x > 0 else 0
+                    to_right = previous_right[square + 1] if x < grid_size - 1 else 0
+
+                    current_up[square] = above + to_left + to_right
+                    current_left[square] = above + to_left
+                    current_right[square] = above + to_right
+                else:
+                    current_up[square] = above
+
+            up.append(current_up)
+            left.append(current_left)
+            right.append(current_right)
+
+        return up, left, right
+
+
+def path_counts(grid_size: int, path_length: int, cache_dir: str | None = None) -> PathCounts:
+    """
+    Returns the count tables for the given grid size and path length. Tables
+    are cached in memory, and in the given directory (or :data:`CACHE_DIR` if
+    None) if there is one, so they are only built once.
+
+    Arguments:
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        path_length (int): Length of the paths.
+        cache_dir (str): Directory to store count tables in.
+
+    Returns:
+        :class:`~PathCounts`
+    """
+
+    key = (grid_size, path_length)
+
+    with _CACHE_LOCK:
+        counts = _CACHE.get(key)
+        if counts is not None:
+            _CACHE.move_to_end(key)
+            return counts
+
+    if cache_dir is None:
+        cache_dir = CACHE_DIR
+
+    file = None
+    if cache_dir is not None:
+        file = os.path.join(cache_dir, f"counts-{grid_size}-{path_length}.json")
+        if os.path.exists(file):
+            try:
+                with open(file, "r") as f:
+                    counts = PathCounts.from_json(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError):
+                # A damaged table is built again, and replaced
+                counts = None
+
+    if counts is None:
+        counts = PathCounts(grid_size, path_length)
+
+        if file is not None:
+            os.makedirs(cache_dir, exist_ok=True)
+            write_file_atomic(file, json.dumps(counts.to_json(), separators=(",", ":")))
+
+    with _CACHE_LOCK:
+        _CACHE[key] = counts
+        if len(_CACHE) > MAX_CACHED_TABLES:
+            _CACHE.popitem(last=False)
+
+    return counts
+
+
+def sample_path(path_length: int, grid_size: int, rng: random.Random = random) -> list[tuple[int]] | None:
+    """
+    Draws a path of the given length and grid size uniformly at random from
+    all the possible paths that never move down.
+
+    Arguments:
+        path_length (int): Desired length of the path.
+        grid_size (int): Size of one dimension of the grid (ex. 5x5 => 5).
+        rng (:class:`~random.Random`): Random number generator to use.
+
+    Returns:
+        list or None: The path, None if there are no possible paths.
+    """
+
+    return path_counts(grid_size, path_length).sample(rng)
@@ -0,0 +1,128 @@
+"""
+Module for remembering which paths a player has already seen, by their
+fingerprint, so the same maze isn't dealt twice. See
+:func:`memorymaze.grid.path_hash`.
+"""
+
+import os
+import struct
+import sys
+import threading
+import traceback
+
+from array import array
+
+MAGIC = b"MMSP"
+
+# How many paths to remember by default.
+DEFAULT_CAPACITY = 256
+
+# Version of the seen paths file format.
+FILE_VERSION = 1
+
+_HEADER = struct.Struct("<4sH")
+
+
+class SeenPaths:
+    """
+    Bounded set of path fingerprints. Once full, the oldest fingerprints are
+    forgotten first. Adding and checking a fingerprint take constant time.
+
+    Arguments:
+        capacity (int): Maximum number of fingerprints to remember.
+        file (str): Path where the fingerprints are stored, so they survive
+            restarts, or None to keep them in memory only. The file is read
+            on construction, and written by :meth:`write`.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, file: str | None = None):
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive")
+
+        self._capacity = capacity
+        self._file = file
+        # Dictionaries keep insertion order, so the first key is the oldest
+        self._hashes = {}
+        # Paths may be generated on another thread, see MemoryMaze
+        self._lock = threading.Lock()
+
+        if file is not None:
+            self._read()
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, path_hash: int) -> bool:
+        return path_hash in self._hashes
+
+    def add(self, path_hash: int) -> bool:
+        """
+        Remembers a path fingerprint, forgetting the oldest one if full.
+
+        Arguments:
+            path_hash (int): The fingerprint.
+
+        Returns:
+            bool: False if the fingerprint was already remembered, otherwise
+                True.
+        """
+
+        with self._lock:
+            if path_hash in self._hashes:
+                return False
+
+            self._hashes[path_hash] = None
+            if len(self._hashes) > self._capacity:
+                del self._hashes[next(iter(self._hashes))]
+
+            return True
+
+    def write(self):
+        """
+        Writes the fingerprints to the file, oldest first. Does nothing
+        without a file.
+        """
+
+        if self._file is None:
+            return
+
+        with self._lock:
+            hashes = array("Q", self._hashes)
+
+        if sys.byteorder != "little":
+            hashes.byteswap()
+
+        try:
+            with open(self._file, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, FILE_VERSION))
+                f.write(hashes.tobytes())
+        except:
+            print(traceback.format_exc())
+
+    def _read(self):
+        """
+        Reads the fingerprints from the file. A missing or unreadable file
+        gives an empty set.
+        """
+
+        if not os.path.exists(self._file):
+            return
+
+        try:
+            with open(self._file, "rb") as f:
+                data = f.read()
+
+            magic, version = _HEADER.unpack_from(data)
+            if magic != MAGIC or version != FILE_VERSION:
+                return
+
+            hashes = array("Q")
+            hashes.frombytes(data[_HEADER.size:])
+            if sys.byteorder != "little":
+                hashes.byteswap()
+
+            # Keep the newest fingerprints if the capacity shrank
+            for path_hash in hashes[-self._capacity:]:
+                self._hashes[path_hash] = None
+        except:
+            print(traceback.format_exc())
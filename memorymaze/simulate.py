@@ -0,0 +1,365 @@
+"""
+Module for simulating games headlessly with bot players, to tune the
+progression settings in :mod:`memorymaze.gamestate` from data rather than by
+hand.
+Games are played in chunks on a process pool, and aggregate results are
+streamed as chunks finish, so millions of games can run while the results so
+far are watched.
+
+Run with ``python -m memorymaze.simulate``.
+"""
+
+import argparse
+import os
+import random
+import time
+
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+
+from memorymaze import MemoryMaze
+from memorymaze.gamestate import GameState
+from memorymaze.gamestate import PATH_SIZE_MULTIPLER
+from memorymaze.gamestate import START_GRID_SIZE
+from memorymaze.gamestate import STARTING_LIVES
+from memorymaze.result import SelectResult
+
+# Games are stopped at this level by default, so perfect players finish.
+MAX_LEVEL = 50
+
+# Number of games each task in the pool plays by default.
+CHUNK_SIZE = 1000
+
+
+class ForgetfulPlayer:
+    """
+    Bot player that remembers the path perfectly, except that it forgets each
+    step with a given probability, and then selects a wrong square next to the
+    last one instead.
+
+    Arguments:
+        forget_probability (float): Probability of forgetting each step.
+    """
+
+    def __init__(self, forget_probability: float = 0.0):
+        if not 0 <= forget_probability <= 1:
+            raise ValueError("Forget probability must be between 0 and 1")
+
+        self._forget_probability = forget_probability
+
+    @property
+    def forget_probability(self) -> float:
+        """
+        Returns the probability of forgetting each step.
+
+        Returns:
+            float
+        """
+
+        return self._forget_probability
+
+    def move(self, memory_maze: MemoryMaze, rng: random.Random) -> tuple[int]:
+        """
+        Returns the square to select next.
+
+        Arguments:
+            memory_maze (:class:`~MemoryMaze`): The game being played.
+            rng (:class:`~random.Random`): Random number generator to use.
+
+        Returns:
+            tuple: Grid coordinates.
+        """
+
+        grid = memory_maze.grid
+        path = grid.path
+        correct = path[grid.current_index]
+
+        if rng.random() >= self._forget_probability:
+            return correct
+
+        grid_size = grid.grid_size
+        last_position = grid.last_position
+
+        if last_position is None:
+            # Any other square on the bottom row
+            wrong = [(x, grid_size - 1) for x in range(grid_size) if x != correct[0]]
+        else:
+            selected = set(path[:grid.current_index])
+            px, py = last_position
+            wrong = [(x, y) for x, y in ((px - 1, py), (px + 1, py), (px, py - 1), (px, py + 1))
+                if 0 <= x < grid_size and 0 <= y < grid_size and (x, y) != correct and (x, y) not in selected]
+
+        # Nothing wrong to select, e.g. in a corner
+        if not wrong:
+            return correct
+
+        return rng.choice(wrong)
+
+
+class SimulationResult:
+    """
+    Class aggregating the results of simulated games.
+
+    Arguments:
+        levels (dict): Number of games that ended on each level.
+        generation_seconds (float): Total time spent setting up new levels,
+            which is dominated by path generation.
+        generations (int): Number of new levels set up.
+    """
+
+    def __init__(self, levels: dict[int, int] | None = None, generation_seconds: float = 0.0,
+            generations: int = 0):
+        self._levels = dict(levels or {})
+        self._generation_seconds = generation_seconds
+        self._generations = generations
+
+    @property
+    def games(self) -> int:
+        """
+        Returns the number of games played.
+
+        Returns:
+            int
+        """
+
+        return sum(self._levels.values())
+
+    @property
+    def levels(self) -> dict[int, int]:
+        """
+        Returns the number of games that ended on each level, by level.
+
+        Returns:
+            dict
+        """
+
+        return dict(sorted(self._levels.items()))
+
+    @property
+    def average_level(self) -> float:
+        """
+        Returns the average level games ended on. Returns 0 if no games were
+        played.
+
+        Returns:
+            float
+        """
+
+        games = self.games
+        if games == 0:
+            return 0.0
+
+        return sum(level * count for level, count in self._levels.items()) / games
+
+    @property
+    def generation_seconds(self) -> float:
+        """
+        Returns the total time spent setting up new levels.
+
+        Returns:
+            float
+        """
+
+        return self._generation_seconds
+
+    @property
+    def generations(self) -> int:
+        """
+        Returns the number of new levels set up.
+
+        Returns:
+            int
+        """
+
+        return self._generations
+
+    def record(self, level: int, generation_seconds: float, generations: int):
+        """
+        Records one game.
+
+        Arguments:
+            level (int): Level the game ended on.
+            generation_seconds (float): Time spent setting up new levels.
+            generations (int): Number of new levels set up.
+        """
+
+        self._levels[level] = self._levels.get(level, 0) + 1
+        self._generation_seconds += generation_seconds
+        self._generations += generations
+
+    def merge(self, other):
+        """
+        Adds the results of another :class:`~SimulationResult` to this one.
+
+        Arguments:
+            other (:class:`~SimulationResult`): Results to add.
+        """
+
+        for level, count in other._levels.items():
+            self._levels[level] = self._levels.get(level, 0) + count
+        self._generation_seconds += other._generation_seconds
+        self._generations += other._generations
+
+
+def play_game(player, rng: random.Random, game_state: GameState, max_level: int = MAX_LEVEL) -> tuple:
+    """
+    Plays one game to the end, or until the given level is reached.
+
+    Arguments:
+        player: Bot player, such as a :class:`~ForgetfulPlayer`.
+        rng (:class:`~random.Random`): Random number generator for the player.
+        game_state (:class:`~GameState`): Game state to play with, at its
+            first level.
+        max_level (int): Level at which to stop the game.
+
+    Returns:
+        tuple: The level the game ended on, the time spent setting up new
+            levels and the number of new levels set up.
+    """
+
+    memory_maze = MemoryMaze(prefetch=False, game_state=game_state)
+    generation_seconds = 0.0
+    generations = 0
+
+    while game_state.level < max_level:
+        x, y = player.move(memory_maze, rng)
+
+        start = time.perf_counter()
+        result = memory_maze.select(x, y)
+
+        if result == SelectResult.COMPLETE:
+            generation_seconds += time.perf_counter() - start
+            generations += 1
+        elif result == SelectResult.GAME_OVER:
+            break
+
+    return game_state.level, generation_seconds, generations
+
+
+def run_games(games: int, player, seed=None, max_level: int = MAX_LEVEL,
+        start_grid_size: int = START_GRID_SIZE, starting_lives: int = STARTING_LIVES,
+        path_size_multiplier: float = PATH_SIZE_MULTIPLER) -> SimulationResult:
+    """
+    Plays the given number of games in this process.
+
+    Arguments:
+        games (int): Number of games.
+        player: Bot player, such as a :class:`~ForgetfulPlayer`.
+        seed: Seed for the player's choices, None for random choices. Paths
+            are random either way.
+        max_level (int): Level at which to stop each game.
+        start_grid_size (int): Grid size on level 1.
+        starting_lives (int): How many lives to start with.
+        path_size_multiplier (float): Multiplier to use when calculating how
+            long the path should be based on the grid size.
+
+    Returns:
+        :class:`~SimulationResult`
+    """
+
+    rng = random.Random(seed)
+    result = SimulationResult()
+
+    for _ in range(games):
+        game_state = GameState(start_grid_size, starting_lives, path_size_multiplier)
+        result.record(*play_game(player, rng, game_state, max_level))
+
+    return result
+
+
+def simulate(games: int, player, workers: int | None = None, chunk_size: int = CHUNK_SIZE, seed=None,
+        max_level: int = MAX_LEVEL, start_grid_size: int = START_GRID_SIZE, starting_lives: int = STARTING_LIVES,
+        path_size_multiplier: float = PATH_SIZE_MULTIPLER):
+    """
+    Plays the given number of games on a process pool, in chunks, yielding
+    the aggregate results so far each time a chunk finishes. Only a few
+    chunks are queued at a time, so any number of games can be played.
+
+    Arguments:
+        games (int): Number of games.
+        player: Bot player, such as a :class:`~ForgetfulPlayer`. It must be
+            picklable.
+        workers (int): Number of worker processes, None for one per CPU.
+        chunk_size (int): Number of games each task plays.
+        seed: Seed for the players' choices, None for random choices. Each
+            chunk gets its own seed derived from it.
+        max_level (int): Level at which to stop each game.
+        start_grid_size (int): Grid size on level 1.
+        starting_lives (int): How many lives to start with.
+        path_size_multiplier (float): Multiplier to use when calculating how
+            long the path should be based on the grid size.
+
+    Yields:
+        :class:`~SimulationResult`: Results of every game finished so far.
+    """
+
+    if games <= 0:
+        raise ValueError("Number of games must be positive")
+
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be positive")
+
+    # Checks the settings before starting any workers
+    GameState(start_grid_size, starting_lives, path_size_multiplier)
+
+    workers = workers or os.cpu_count() or 1
+    chunks = [(i, min(chunk_size, games - i * chunk_size)) for i in range((games + chunk_size - 1) // chunk_size)]
+    chunks.reverse()
+    total = SimulationResult()
+
+    with ProcessPoolExecutor(workers) as pool:
+        pending = set()
+
+        while chunks or pending:
+            # Keep every worker busy, with one chunk queued behind each
+            while chunks and len(pending) < 2 * workers:
+                i, count = chunks.pop()
+                chunk_seed = None if seed is None else f"{seed!r}:{i}"
+                pending.add(pool.submit(run_games, count, player, chunk_seed, max_level, start_grid_size,
+                    starting_lives, path_size_multiplier))
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                total.merge(future.result())
+            yield total
+
+
+def main(args: list[str] | None = None):
+    """
+    Command line entry point for running a simulation and printing the
+    results as they come in.
+
+    Arguments:
+        args (list): Command line arguments, None for :data:`sys.argv`.
+    """
+
+    parser = argparse.ArgumentParser(prog="python -m memorymaze.simulate",
+        description="Simulate games with bot players to tune the progression settings.")
+    parser.add_argument("--games", type=int, default=100000, help="number of games to play")
+    parser.add_argument("--forget", type=float, default=0.05, help="probability of forgetting each step")
+    parser.add_argument("--workers", type=int, help="number of worker processes")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="games per task")
+    parser.add_argument("--seed", help="seed for the players' choices")
+    parser.add_argument("--max-level", type=int, default=MAX_LEVEL, help="level at which to stop each game")
+    parser.add_argument("--start-grid-size", type=int, default=START_GRID_SIZE, help="grid size on level 1")
+    parser.add_argument("--starting-lives", type=int, default=STARTING_LIVES, help="lives to start with")
+    parser.add_argument("--path-size-multiplier", type=float, default=PATH_SIZE_MULTIPLER,
+        help="path length as a multiple of the grid size")
+    args = parser.parse_args(args)
+
+    result = None
+    for result in simulate(args.games, ForgetfulPlayer(args.forget), args.workers, args.chunk_size, args.seed,
+            args.max_level, args.start_grid_size, args.starting_lives, args.path_size_multiplier):
+        print(f"{result.games} games, average level {result.average_level:.2f}")
+
+    print("level  games")
+    for level, count in result.levels.items():
+        print(f"{level:5}  {count}")
+
+    if result.generations:
+        print(f"{result.generation_seconds / result.generations * 1e6:.0f} us per level set up")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+from enum import Enum
+
+class PathStrategy(Enum):
+    """
+    Enum identifying the algorithm that produced a path.
+
+    Attributes:
+        BACKTRACK: Randomized depth-first search with backtracking.
+        CONSTRUCTIVE: Direct construction of a path that only ever moves up or
+            sideways, in time linear in the path length, without any search.
+            Also used as the fallback when a search runs out of budget.
+        UNIFORM: Draw uniformly at random from all the paths that only ever
+            move up or sideways, using cached tables counting those paths.
+        PARALLEL: Race several independently seeded randomized searches on a
+            process pool and take the first path found.
+    """
+
+    BACKTRACK = "backtrack"
+    CONSTRUCTIVE = "constructive"
+    UNIFORM = "uniform"
+    PARALLEL = "parallel"
@@ -3,6 +3,8 @@ import tkinter as tk
 from memorymaze import MemoryMaze
 from memorymaze.animation import ANIMATION_CLEAR_DELAY
 from memorymaze.animation import ANIMATION_DELAY
+from memorymaze.change import Change
+from memorymaze.change import ChangeType
 from memorymaze.keyutil import is_down
 from memorymaze.keyutil import is_left
 from memorymaze.keyutil import is_right
@@ -32,6 +34,8 @@ class GridCanvas(tk.Canvas):
         self._memory_maze = memory_maze
         self._showing_path = False
 
+        self._memory_maze.subscribe(self._on_changes)
+
     def redraw(self):
         """
         Redraws the grid.
@@ -114,27 +118,14 @@ class GridCanvas(tk.Canvas):
             :class:`~SelectResult`
         """
 
+        # Selected squares are drawn by _on_changes()
         result = self._memory_maze.select(x, y)
 
-        tile_width, tile_height = self._tile_dimensions
-        canvas_x0, canvas_y0 = self._to_canvas_coords(x, y, tile_width, tile_height)
-        canvas_x1, canvas_y1 = (canvas_x0 + tile_width, canvas_y0 + tile_height)
-
-        if result == SelectResult.CORRECT:
-            # Green square
-            self.create_rectangle(canvas_x0, canvas_y0, canvas_x1, canvas_y1,
-                fill=CORRECT_COLOR, outline=OUTLINE_COLOR, width=str(OUTLINE_WIDTH))
-            
-            return result
         if result == SelectResult.COMPLETE:
             # Success! Show path for next level
             self._redraw_and_show_path()
             return result
         if result in (SelectResult.INCORRECT, SelectResult.GAME_OVER):
-            # Red square
-            self.create_rectangle(canvas_x0, canvas_y0, canvas_x1, canvas_y1,
-                fill=INCORRECT_COLOR, outline=OUTLINE_COLOR, width=str(OUTLINE_WIDTH))
-            
             # Don't allow input after an incorrect square is clicked
             self._memory_maze.lock()
 
@@ -154,16 +145,8 @@ class GridCanvas(tk.Canvas):
             idx: Current index of the path we are drawing.
         """
 
-        x, y = self._memory_maze.grid.path[idx]
-
-        tile_width, tile_height = self._tile_dimensions
-
-        canvas_x0, canvas_y0 = self._to_canvas_coords(x, y, tile_width, tile_height)
-        canvas_x1, canvas_y1 = (canvas_x0 + tile_width, canvas_y0 + tile_height)
-
         # Draw next path space
-        self.create_rectangle(canvas_x0, canvas_y0, canvas_x1, canvas_y1,
-            fill=PATH_COLOR, outline=OUTLINE_COLOR, width=str(OUTLINE_WIDTH))
+        self._draw_tile(*self._memory_maze.grid.path[idx], PATH_COLOR)
 
         if idx < self._memory_maze.game_state.path_size - 1:
             # Wait and show next square after a delay
@@ -172,6 +155,44 @@ class GridCanvas(tk.Canvas):
             # Completed path shown, clear after extended delay
             self.after(ANIMATION_CLEAR_DELAY, lambda: self._on_show_path_complete())
 
+    def _on_changes(self, changes: list[Change]):
+        """
+        Called when the game changes, to draw only the squares affected.
+
+        Arguments:
+            changes (list): The changes.
+        """
+
+        # A new path means the whole grid is redrawn before it's shown
+        if any(change.type == ChangeType.PATH_READY for change in changes):
+            return
+
+        for change in changes:
+            if change.type == ChangeType.TILE_CORRECT:
+                # Green square
+                self._draw_tile(*change.position, CORRECT_COLOR)
+            elif change.type == ChangeType.TILE_INCORRECT:
+                # Red square
+                self._draw_tile(*change.position, INCORRECT_COLOR)
+
+    def _draw_tile(self, x: int, y: int, color: str):
+        """
+        Draws a single square of the grid.
+
+        Arguments:
+            x (int): Grid X coordinate.
+            y (int): Grid Y coordinate.
+            color (str): Fill color.
+        """
+
+        tile_width, tile_height = self._tile_dimensions
+
+        canvas_x0, canvas_y0 = self._to_canvas_coords(x, y, tile_width, tile_height)
+        canvas_x1, canvas_y1 = (canvas_x0 + tile_width, canvas_y0 + tile_height)
+
+        self.create_rectangle(canvas_x0, canvas_y0, canvas_x1, canvas_y1,
+            fill=color, outline=OUTLINE_COLOR, width=str(OUTLINE_WIDTH))
+
     def _on_show_path_complete(self):
         """
         Called when the path drawing is complete.
@@ -3,8 +3,11 @@ import tkinter as tk
 from memorymaze import MemoryMaze
 from memorymaze.animation import ANIMATION_DELAY
 from memorymaze.animation import ANIMATION_CLEAR_DELAY
+from memorymaze.change import Change
+from memorymaze.change import ChangeType
 from memorymaze.data import MemoryMazeData
 from memorymaze.gamestate import GameState
+from memorymaze.seen import SeenPaths
 from memorymaze.style import BOLD
 from memorymaze.style import PRIMARY_COLOR
 from memorymaze.style import SECONDARY_COLOR
@@ -25,6 +28,7 @@ MEMORY_MAZE_LOGO = resource_path("assets/memory-maze-logo.png")
 LIVES_IMAGE = resource_path("assets/lives.png")
 
 DATA_FILE = resource_path("data.dat")
+SEEN_PATHS_FILE = resource_path("seen.dat")
 
 
 class MemoryMazeRoot(tk.Tk):
@@ -40,12 +44,15 @@ class MemoryMazeRoot(tk.Tk):
         self.iconbitmap(MEMORY_MAZE_ICON)
         self.configure(bg=PRIMARY_COLOR, padx=50, pady=25)
 
-        self._memory_maze = MemoryMaze()
+        self._seen_paths = SeenPaths(file=SEEN_PATHS_FILE)
+        self._memory_maze = MemoryMaze(seen_paths=self._seen_paths)
         self._data = MemoryMazeData()
         self._data.read_default()
 
-        self._level_text = tk.StringVar()
-        self._lives_text = tk.StringVar()
+        # Later updated by _on_changes, when the level or lives change
+        self._level_text = tk.StringVar(value=str(self._game_state.level))
+        self._lives_text = tk.StringVar(value=str(self._game_state.lives))
+        self._memory_maze.subscribe(self._on_changes)
 
         game_container = tk.Frame(self, bg=PRIMARY_COLOR)
 
@@ -162,11 +169,12 @@ class MemoryMazeRoot(tk.Tk):
             grid_canvas (:class:`~GridCanvas`): Grid canvas object.
         """
 
-        self._memory_maze.reset()
+        # The first game uses the path made on startup, so it isn't wasted
+        if self._game_state.is_game_over:
+            self._memory_maze.reset()
         start_frame.place_forget()
         grid_canvas.redraw()
         grid_canvas.after(ANIMATION_DELAY, lambda: grid_canvas.show_path())
-        self._redraw_variables()
     
     def _on_grid_canvas_click(self, event, grid_canvas: GridCanvas):
         """
@@ -196,15 +204,13 @@ class MemoryMazeRoot(tk.Tk):
     
     def _redraw_and_fire_events(self, grid_canvas: GridCanvas):
         """
-        Updates the level and number of lives, and fires any applicable
-        event-driven methods.
+        Fires any applicable event-driven methods. The level and number of
+        lives are updated by :meth:`_on_changes`.
 
         Arguments:
             grid_canvas (:class:`~GridCanvas`): Grid grid_canvas object.
         """
 
-        self._redraw_variables()
-
         if self._game_state.is_game_over:
             self._on_game_over(grid_canvas)
     
@@ -218,12 +224,20 @@ class MemoryMazeRoot(tk.Tk):
 
         self._data.record(self._game_state)
         self._data.write_default()
+        self._seen_paths.write()
         self.after(ANIMATION_CLEAR_DELAY, lambda: self._show_game_over(grid_canvas))
     
-    def _redraw_variables(self):
+    def _on_changes(self, changes: list[Change]):
         """
-        Updates the game state variables, such as level and lives.
+        Called when the game changes, to update the level and number of lives
+        when they change.
+
+        Arguments:
+            changes (list): The changes.
         """
 
-        self._level_text.set(str(self._game_state.level))
-        self._lives_text.set(str(self._game_state.lives))
+        for change in changes:
+            if change.type == ChangeType.LEVEL_CHANGED:
+                self._level_text.set(str(change.value))
+            elif change.type == ChangeType.LIVES_CHANGED:
+                self._lives_text.set(str(change.value))
@@ -4,6 +4,7 @@ Utility functions.
 
 import os
 import sys
+import tempfile
 
 def resource_path(relative_path: str) -> str:
     """
@@ -19,3 +20,24 @@ def resource_path(relative_path: str) -> str:
     if hasattr(sys, '_MEIPASS'):
         return os.path.join(sys._MEIPASS, relative_path)
     return os.path.join(os.path.abspath("."), relative_path)
+
+
+def write_file_atomic(file: str, text: str):
+    """
+    Writes text to a file, through a temporary file in the same directory
+    that then replaces it, so readers never see a partly written file, even
+    if writing fails or another process writes the same file.
+
+    Arguments:
+        file (str): Path of the file.
+        text (str): Text to write.
+    """
+
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(file)), suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, "w") as f:
+            f.write(text)
+        os.replace(temporary, file)
+    except:
+        os.remove(temporary)
+        raise
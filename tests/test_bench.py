@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import unittest
+
+from memorymaze.__main__ import main
+from memorymaze.bench import bench_codec
+from memorymaze.bench import bench_data
+from memorymaze.bench import bench_generate_path
+from memorymaze.bench import bench_select
+from memorymaze.bench import bench_sessions
+from memorymaze.bench import peak_memory
+from memorymaze.bench import run_benchmarks
+
+
+class TestBench(unittest.TestCase):
+
+    def test_benchGeneratePath(self):
+        result = bench_generate_path(2, repeat=3)
+
+        self.assertEqual(result["gridSize"], 6)
+        self.assertEqual(result["pathLength"], 10)
+        self.assertGreater(result["maxSeconds"], 0)
+    
+    def test_benchSelect(self):
+        self.assertGreater(bench_select(37, 7, repeat=1), 0)
+    
+    def test_benchSelect_notPossible(self):
+        with self.assertRaises(ValueError):
+            bench_select(1000, 5, repeat=1)
+    
+    def test_benchData(self):
+        result = bench_data(10)
+
+        self.assertGreater(result["fileBytes"], 0)
+        self.assertGreater(result["readSeconds"], 0)
+        self.assertGreater(result["historySeconds"], 0)
+    
+    def test_benchCodec(self):
+        self.assertGreater(bench_codec(1, repeat=1), 0)
+    
+    def test_benchSessions(self):
+        self.assertGreater(bench_sessions(10), 0)
+    
+    def test_peakMemory(self):
+        self.assertGreaterEqual(peak_memory(bytearray, 100000), 100000)
+    
+    def test_runBenchmarks(self):
+        results = run_benchmarks(levels=2, entries=(5,), sessions=0, log=lambda message: None, codec_megabytes=(1,))
+
+        self.assertEqual(set(results["generatePath"]), {"1", "2"})
+        self.assertEqual(set(results["data"]), {"5"})
+        self.assertIn("peakBytes", results["data"]["5"])
+        self.assertEqual(set(results["codec"]), {"1"})
+        self.assertNotIn("bytesPerSession", results)
+    
+    def test_main_bench(self):
+        with tempfile.TemporaryDirectory() as directory:
+            file = os.path.join(directory, "bench.json")
+            main(["bench", "--levels", "1", "--entries", "5", "--sessions", "0", "--codec-megabytes", "1", "--no-memory", "--output", file])
+
+            with open(file, "r") as f:
+                results = json.load(f)
+
+        self.assertEqual(set(results["generatePath"]), {"1"})
+        self.assertNotIn("peakBytes", results["data"]["5"])
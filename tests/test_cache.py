@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+from memorymaze.cache import PathCache
+from memorymaze.strategy import PathStrategy
+
+
+class TestPathCache(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._file = os.path.join(self._dir.name, "paths.json")
+        self._cache = PathCache(self._file, capacity=2)
+        self._path = [(1, 4), (1, 3), (2, 3), (2, 2), (2, 1), (2, 0)]
+    
+    def tearDown(self):
+        self._dir.cleanup()
+    
+    def test_get_empty(self):
+        self.assertIsNone(self._cache.get(1, PathStrategy.BACKTRACK, 5, 6))
+    
+    def test_put(self):
+        self._cache.put(1, PathStrategy.BACKTRACK, 5, 6, self._path, PathStrategy.CONSTRUCTIVE)
+
+        path, path_strategy = self._cache.get(1, PathStrategy.BACKTRACK, 5, 6)
+        self.assertEqual(path, self._path)
+        self.assertEqual(path_strategy, PathStrategy.CONSTRUCTIVE)
+    
+    def test_put_keyedByStrategy(self):
+        self._cache.put(1, PathStrategy.BACKTRACK, 5, 6, self._path, PathStrategy.BACKTRACK)
+        self.assertIsNone(self._cache.get(1, PathStrategy.UNIFORM, 5, 6))
+    
+    def test_put_persisted(self):
+        self._cache.put(1, PathStrategy.BACKTRACK, 5, 6, self._path, PathStrategy.BACKTRACK)
+
+        path, _ = PathCache(self._file).get(1, PathStrategy.BACKTRACK, 5, 6)
+        self.assertEqual(path, self._path)
+    
+    def test_put_evictsLeastRecentlyUsed(self):
+        self._cache.put(1, PathStrategy.BACKTRACK, 5, 6, self._path, PathStrategy.BACKTRACK)
+        self._cache.put(2, PathStrategy.BACKTRACK, 5, 6, self._path, PathStrategy.BACKTRACK)
+        # Use the first path, so the second is least recently used
+        self._cache.get(1, PathStrategy.BACKTRACK, 5, 6)
+        self._cache.put(3, PathStrategy.BACKTRACK, 5, 6, self._path, PathStrategy.BACKTRACK)
+
+        self.assertEqual(len(self._cache), 2)
+        self.assertIsNotNone(self._cache.get(1, PathStrategy.BACKTRACK, 5, 6))
+        self.assertIsNone(self._cache.get(2, PathStrategy.BACKTRACK, 5, 6))
+        self.assertIsNotNone(self._cache.get(3, PathStrategy.BACKTRACK, 5, 6))
+    
+    def test_unreadableFile_empty(self):
+        with open(self._file, "w") as f:
+            f.write("not json")
+        
+        self.assertEqual(len(PathCache(self._file)), 0)
+    
+    def test_zeroCapacity(self):
+        with self.assertRaises(ValueError) as error:
+            PathCache(self._file, capacity=0)
+        self.assertEqual(str(error.exception), "Capacity must be positive")
@@ -0,0 +1,364 @@
+import importlib.util
+import os
+import struct
+import tempfile
+import unittest
+
+from unittest import mock
+
+from datetime import datetime, timezone
+
+from memorymaze.data import DATETIME_FORMAT
+from memorymaze.data import ENCRYPTION_KEY
+from memorymaze.data import MemoryMazeData
+from memorymaze.data import xor_bytes
+from memorymaze.gamestate import GameState
+
+
+def record(data: MemoryMazeData, *levels: int):
+    game_state = GameState()
+    for level in levels:
+        game_state.restore(level, 0)
+        data.record(game_state)
+
+
+def xor_reference(data: bytes, offset: int) -> bytes:
+    return bytes(b ^ ord(ENCRYPTION_KEY[(offset + i) % len(ENCRYPTION_KEY)]) for i, b in enumerate(data))
+
+
+def write_legacy(file: str, high_score: int, entries: list[tuple]):
+    history = "".join(f"<entry><dateCompleted>{date.strftime(DATETIME_FORMAT)}</dateCompleted>"
+        f"<score>{score}</score></entry>" for date, score in entries)
+    xml = f"<memoryMaze><history>{history}</history><highScore>{high_score}</highScore></memoryMaze>".encode()
+
+    with open(file, "wb") as f:
+        f.write(xor_reference(xml, 0))
+
+
+class TestXorBytes(unittest.TestCase):
+
+    def setUp(self):
+        self._data = os.urandom(200000)
+
+    def test_xorBytes_small(self):
+        for offset in (0, 3, 10, 25):
+            for length in (0, 1, 11, 100):
+                self.assertEqual(xor_bytes(self._data[:length], offset), xor_reference(self._data[:length], offset))
+    
+    def test_xorBytes_blocks(self):
+        with mock.patch("memorymaze.data._numpy", return_value=None):
+            for offset in (0, 7):
+                self.assertEqual(xor_bytes(self._data, offset), xor_reference(self._data, offset))
+    
+    @unittest.skipUnless(importlib.util.find_spec("numpy"), "NumPy is not installed")
+    def test_xorBytes_numpy(self):
+        for offset in (0, 7):
+            self.assertEqual(xor_bytes(self._data, offset), xor_reference(self._data, offset))
+    
+    def test_xorBytes_twice(self):
+        self.assertEqual(xor_bytes(xor_bytes(self._data, 5), 5), self._data)
+
+
+class TestMemoryMazeData(unittest.TestCase):
+
+    def setUp(self):
+        self._directory = tempfile.TemporaryDirectory()
+        self._file = os.path.join(self._directory.name, "data.dat")
+
+    def tearDown(self):
+        self._directory.cleanup()
+
+    def test_write_read(self):
+        data = MemoryMazeData()
+        record(data, 3, 7, 5)
+
+        self.assertTrue(data.write(self._file))
+
+        read = MemoryMazeData()
+        self.assertTrue(read.read(self._file))
+        self.assertEqual(read.high_score, 7)
+        self.assertEqual(read.average, 5)
+        self.assertEqual([entry.score for entry in read.history], [3, 7, 5])
+        self.assertEqual([entry.date_completed for entry in read.history],
+            [entry.date_completed for entry in data.history])
+    
+    def test_write_appendsRecords(self):
+        data = MemoryMazeData()
+        record(data, 3)
+        data.write(self._file)
+        size = os.path.getsize(self._file)
+
+        with open(self._file, "rb") as f:
+            before = f.read()
+
+        record(data, 2)
+        data.write(self._file)
+        record(data, 4)
+        data.write(self._file)
+
+        with open(self._file, "rb") as f:
+            after = f.read()
+
+        # The first record is left alone, and only the header is rewritten
+        header_size = size - (len(after) - size) // 2
+        self.assertEqual(after[header_size:size], before[header_size:])
+        self.assertNotEqual(after[:header_size], before[:header_size])
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertEqual([entry.score for entry in read.history], [3, 2, 4])
+        self.assertEqual(read.high_score, 4)
+    
+    def test_write_afterRead_appends(self):
+        data = MemoryMazeData()
+        record(data, 3, 7)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        record(read, 8)
+        read.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertEqual([entry.score for entry in read.history], [3, 7, 8])
+        self.assertEqual(read.high_score, 8)
+    
+    def test_write_fileChanged_rewritesFile(self):
+        data = MemoryMazeData()
+        record(data, 3)
+        data.write(self._file)
+
+        other = MemoryMazeData()
+        record(other, 1, 1)
+        other.write(self._file)
+
+        record(data, 2)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertEqual([entry.score for entry in read.history], [3, 2])
+    
+    def test_read_partialRecord_ignored(self):
+        data = MemoryMazeData()
+        record(data, 3, 7)
+        data.write(self._file)
+
+        with open(self._file, "r+b") as f:
+            f.truncate(os.path.getsize(self._file) - 1)
+
+        read = MemoryMazeData()
+        self.assertTrue(read.read(self._file))
+        self.assertEqual([entry.score for entry in read.history], [3])
+
+        record(read, 2)
+        read.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertEqual([entry.score for entry in read.history], [3, 2])
+    
+    def test_read_legacy_converts(self):
+        date = datetime(2023, 5, 1, 12, 30, 15, 123456)
+        write_legacy(self._file, 9, [(date, 4), (date, 7)])
+
+        data = MemoryMazeData()
+        self.assertTrue(data.read(self._file))
+        self.assertEqual(data.high_score, 9)
+        self.assertIsNone(data._history)
+
+        with open(self._file, "rb") as f:
+            self.assertEqual(xor_bytes(f.read(4)), b"MMDF")
+
+        self.assertEqual([entry.score for entry in data.history], [4, 7])
+        self.assertEqual(data.average, 5.5)
+
+        record(data, 2)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        self.assertTrue(read.read(self._file))
+        self.assertEqual([entry.score for entry in read.history], [4, 7, 2])
+        self.assertEqual(read.history[0].date_completed, date.replace(tzinfo=timezone.utc))
+        self.assertEqual(read.high_score, 9)
+        self.assertEqual(os.listdir(self._directory.name), ["data.dat"])
+    
+    def test_read_legacy_chunks(self):
+        date = datetime(2023, 5, 1, 12, 30, 15, 123456)
+        write_legacy(self._file, 6, [(date, score) for score in range(1, 7)])
+
+        data = MemoryMazeData()
+        with mock.patch("memorymaze.data._LEGACY_CHUNK_SIZE", 7), mock.patch("memorymaze.data._LEGACY_BATCH_SIZE", 4):
+            self.assertTrue(data.read(self._file))
+
+        self.assertEqual([entry.score for entry in data.history], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(data.games_played, 6)
+        self.assertEqual(data.average, 3.5)
+    
+    def test_read_legacy_replacedOnceClosed(self):
+        write_legacy(self._file, 9, [(datetime(2023, 5, 1), 4)])
+        opened = []
+        replace = os.replace
+
+        def open_(*args, **kwargs):
+            f = open(*args, **kwargs)
+            opened.append(f)
+            return f
+
+        def replace_(source, destination):
+            self.assertTrue(all(f.closed for f in opened if f.name == destination))
+            replace(source, destination)
+
+        data = MemoryMazeData()
+        with mock.patch("memorymaze.data.open", side_effect=open_, create=True), \
+                mock.patch("memorymaze.data.os.replace", side_effect=replace_) as replace_mock:
+            self.assertTrue(data.read(self._file))
+
+        replace_mock.assert_called_once()
+        self.assertEqual(os.listdir(self._directory.name), ["data.dat"])
+        self.assertEqual([entry.score for entry in data.history], [4])
+    
+    def test_read_legacy_cannotConvert(self):
+        date = datetime(2023, 5, 1, 12, 30, 15, 123456)
+        write_legacy(self._file, 9, [(date, 4), (date, 9)])
+
+        data = MemoryMazeData()
+        with mock.patch("memorymaze.data.os.replace", side_effect=PermissionError), \
+                mock.patch("builtins.print") as print_:
+            self.assertTrue(data.read(self._file))
+
+        print_.assert_not_called()
+        self.assertEqual(os.listdir(self._directory.name), ["data.dat"])
+        self.assertEqual(data.high_score, 9)
+        self.assertEqual([entry.score for entry in data.history], [4, 9])
+        self.assertEqual(data.average, 6.5)
+
+        record(data, 2)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        self.assertTrue(read.read(self._file))
+        self.assertEqual([entry.score for entry in read.history], [4, 9, 2])
+        self.assertEqual(read.history[0].date_completed, date.replace(tzinfo=timezone.utc))
+    
+    def test_statistics(self):
+        data = MemoryMazeData()
+        record(data, 2, 4, 4, 4, 5, 5, 7, 9)
+
+        self.assertEqual(data.games_played, 8)
+        self.assertEqual(data.high_score, 9)
+        self.assertEqual(data.average, 5)
+        self.assertEqual(data.stddev, 2)
+    
+    def test_statistics_empty(self):
+        data = MemoryMazeData()
+
+        self.assertEqual(data.games_played, 0)
+        self.assertEqual(data.average, 0)
+        self.assertEqual(data.stddev, 0)
+    
+    def test_read_statistics(self):
+        data = MemoryMazeData()
+        record(data, 2, 4, 4, 4, 5, 5, 7, 9)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertEqual(read.games_played, 8)
+        self.assertEqual(read.high_score, 9)
+        self.assertEqual(read.average, 5)
+        self.assertEqual(read.stddev, 2)
+    
+    def test_read_historyLoadedLazily(self):
+        data = MemoryMazeData()
+        record(data, 3, 7)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertIsNone(read._history)
+
+        record(read, 5)
+        read.write(self._file)
+        record(read, 1)
+        self.assertIsNone(read._history)
+        self.assertEqual(read.average, 4)
+
+        self.assertEqual([entry.score for entry in read.history], [3, 7, 5, 1])
+        record(read, 2)
+        self.assertEqual([entry.score for entry in read.history], [3, 7, 5, 1, 2])
+    
+    def test_write_otherFile_readsHistory(self):
+        data = MemoryMazeData()
+        record(data, 3, 7)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        other = os.path.join(self._directory.name, "other.dat")
+        read.write(other)
+
+        read = MemoryMazeData()
+        read.read(other)
+        self.assertEqual([entry.score for entry in read.history], [3, 7])
+    
+    def test_read_headerBehindRecords(self):
+        data = MemoryMazeData()
+        record(data, 3)
+        data.write(self._file)
+        with open(self._file, "rb") as f:
+            old = f.read()
+
+        record(data, 8)
+        data.write(self._file)
+
+        # As if the append finished but the header wasn't rewritten
+        record_size = os.path.getsize(self._file) - len(old)
+        with open(self._file, "r+b") as f:
+            f.write(old[:len(old) - record_size])
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertEqual(read.games_played, 2)
+        self.assertEqual(read.high_score, 8)
+        self.assertEqual(read.average, 5.5)
+    
+    def test_read_version1_migrates(self):
+        records = struct.pack("<qIqI", 0, 3, 1000000, 6)
+        with open(self._file, "wb") as f:
+            f.write(xor_bytes(struct.pack("<4sHI", b"MMDF", 1, 7)))
+            f.write(xor_bytes(records, 10))
+
+        data = MemoryMazeData()
+        self.assertTrue(data.read(self._file))
+        self.assertEqual(data.high_score, 7)
+        self.assertEqual(data.average, 4.5)
+        self.assertEqual(data.history[1].date_completed, datetime(1970, 1, 1, 0, 0, 1, tzinfo=timezone.utc))
+
+        record(data, 2)
+        data.write(self._file)
+
+        read = MemoryMazeData()
+        read.read(self._file)
+        self.assertEqual([entry.score for entry in read.history], [3, 6, 2])
+        self.assertEqual(read.games_played, 3)
+        self.assertEqual(read.high_score, 7)
+    
+    def test_read_missingFile(self):
+        self.assertFalse(MemoryMazeData().read(self._file))
+    
+    def test_read_legacy_invalid(self):
+        with open(self._file, "wb") as f:
+            f.write(xor_bytes(b"<memoryMaze><history><entry>"))
+
+        with mock.patch("builtins.print"):
+            self.assertFalse(MemoryMazeData().read(self._file))
+
+        self.assertEqual(os.listdir(self._directory.name), ["data.dat"])
+    
+    def test_read_invalidFile(self):
+        with open(self._file, "wb") as f:
+            f.write(b"not a data file")
+
+        self.assertFalse(MemoryMazeData().read(self._file))
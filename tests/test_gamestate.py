@@ -55,3 +55,57 @@ class TestGameState(unittest.TestCase):
 
         path_length = round(START_GRID_SIZE * PATH_SIZE_MULTIPLER)
         self.assertEqual(self._game_state.path_size, path_length)
+    
+    def test_size_at(self):
+        self.assertEqual(self._game_state.grid_size_at(3), START_GRID_SIZE + 2)
+        self.assertEqual(self._game_state.path_size_at(3), round((START_GRID_SIZE + 2) * PATH_SIZE_MULTIPLER))
+        self.assertEqual(self._game_state.level, 1)
+    
+    def test_restore(self):
+        self._game_state.restore(4, 1)
+
+        self.assertEqual(self._game_state.level, 4)
+        self.assertEqual(self._game_state.lives, 1)
+    
+    def test_restore_invalid(self):
+        with self.assertRaises(ValueError):
+            self._game_state.restore(0, 1)
+
+        with self.assertRaises(ValueError):
+            self._game_state.restore(1, -1)
+    
+    def test_settings(self):
+        game_state = GameState(start_grid_size=4, starting_lives=5, path_size_multiplier=2)
+
+        self.assertEqual(game_state.lives, 5)
+        self.assertEqual(game_state.grid_size, 4)
+        self.assertEqual(game_state.path_size, 8)
+
+        game_state.lose_life()
+        game_state.reset()
+        self.assertEqual(game_state.lives, 5)
+    
+    def test_settings_invalid(self):
+        with self.assertRaises(ValueError):
+            GameState(start_grid_size=0)
+
+        with self.assertRaises(ValueError):
+            GameState(starting_lives=0)
+
+        with self.assertRaises(ValueError):
+            GameState(path_size_multiplier=0)
+    
+    def test_settings_pathShorterThanGrid(self):
+        with self.assertRaises(ValueError):
+            GameState(path_size_multiplier=0.5)
+    
+    def test_settings_pathTooLongForGrid(self):
+        # A 3x3 grid fits paths of up to 5 squares
+        with self.assertRaises(ValueError):
+            GameState(start_grid_size=3, path_size_multiplier=2)
+
+        # A 5x5 grid fits up to 17, a 6x6 grid up to 26
+        with self.assertRaises(ValueError):
+            GameState(start_grid_size=5, path_size_multiplier=4)
+
+        GameState(start_grid_size=6, path_size_multiplier=4)
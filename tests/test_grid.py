@@ -1,7 +1,16 @@
+import os
+import random
+import tempfile
+import time
 import unittest
 
+from memorymaze.cache import PathCache
+from memorymaze.grid import MAX_REROLLS
 from memorymaze.grid import MemoryMazeGrid
+from memorymaze.grid import path_hash
 from memorymaze.result import SelectResult
+from memorymaze.seen import SeenPaths
+from memorymaze.strategy import PathStrategy
 
 
 class TestGrid(unittest.TestCase):
@@ -25,6 +34,69 @@ class TestGrid(unittest.TestCase):
         
         self.assertEqual(self._grid.path, path)
     
+    def test_path_setPath_equalsGivenPath(self):
+        path = [(1, 4), (1, 3), (2, 3), (2, 2), (2, 1), (2, 0)]
+        self._grid.set_path(path, 5)
+
+        self.assertEqual(self._grid.path, path)
+        self.assertEqual(path, self._grid.path)
+        self.assertEqual(self._grid.path, tuple(path))
+        self.assertNotEqual(self._grid.path, path[:-1])
+        self.assertEqual(list(self._grid.path), path)
+        self.assertEqual(self._grid.path[1:3], path[1:3])
+        self.assertEqual(self._grid.path[-1], (2, 0))
+    
+    def test_path_wideGrid(self):
+        path = [(299, y) for y in range(299, -1, -1)]
+        self._grid.set_path(path, 300)
+
+        self.assertEqual(self._grid.path, path)
+        self.assertEqual(self._grid.select(299, 299), SelectResult.CORRECT)
+        self.assertIsNone(self._grid.select(299, 299))
+    
+    def test_setSquares(self):
+        self._grid.set_squares([21, 16, 17, 12, 7, 2], 5, current_index=2)
+
+        self.assertEqual(self._grid.path, [(1, 4), (1, 3), (2, 3), (2, 2), (2, 1), (2, 0)])
+        self.assertEqual(list(self._grid.squares), [21, 16, 17, 12, 7, 2])
+        self.assertEqual(self._grid.current_index, 2)
+        self.assertEqual(self._grid.last_position, (1, 3))
+        self.assertIsNone(self._grid.select(1, 4))
+        self.assertEqual(self._grid.select(2, 3), SelectResult.CORRECT)
+    
+    def test_setSquares_indexSizedToPath(self):
+        self._grid.set_squares([199 * 200 + 5, 198 * 200 + 5], 200)
+
+        self.assertEqual(len(self._grid._index), 2)
+    
+    def test_setSquares_selectedSquareNextToLast_ignored(self):
+        # Comes back alongside itself, so (1, 3) is selected and adjacent
+        self._grid.set_squares([21, 16, 11, 12, 17, 18], 5, current_index=5)
+
+        self.assertIsNone(self._grid.select(1, 3))
+        self.assertEqual(self._grid.current_index, 5)
+        self.assertEqual(self._grid.select(2, 4), SelectResult.INCORRECT)
+    
+    def test_setSquares_outsideGrid(self):
+        with self.assertRaises(ValueError):
+            self._grid.set_squares([25], 5)
+    
+    def test_setSquares_currentIndexOutsidePath(self):
+        with self.assertRaises(ValueError):
+            self._grid.set_squares([21, 16], 5, current_index=3)
+    
+    def test_setSquares_pathComplete(self):
+        with self.assertRaises(ValueError):
+            self._grid.set_squares([21, 16], 5, current_index=2)
+    
+    def test_setSquares_emptyPath(self):
+        with self.assertRaises(ValueError):
+            self._grid.set_squares([], 5)
+    
+    def test_setSquares_gridSizeNotPositive(self):
+        with self.assertRaises(ValueError):
+            self._grid.set_squares(None, 0)
+    
     def test_lastPosition_nothingSelectedYet(self):
         self.assertIsNone(self._grid.last_position)
     
@@ -84,6 +156,171 @@ class TestGrid(unittest.TestCase):
         path = self._grid.generate_path(5, 8)
         self.assertIsNone(path)
     
+    def test_generatePath_singleSquare(self):
+        path = self._grid.generate_path(1, 1)
+        self.assertEqual(path, [(0, 0)])
+    
+    def test_generatePath_wrongParity_returnsNone(self):
+        # On a 2x2 grid the only possible paths go straight up
+        path = self._grid.generate_path(3, 2)
+        self.assertIsNone(path)
+    
+    def test_generatePath_largeGrid(self):
+        path = self._grid.generate_path(48, 30)
+        self.assertEqual(48, len(path))
+        self.assertEqual(path[0][1], 29)
+        self.assertEqual(path[-1][1], 0)
+    
+    def test_generatePath_longerThanRecursionLimit(self):
+        path = self._grid.generate_path(1200, 1200)
+        self.assertEqual(1200, len(path))
+        self.assertEqual(path[-1][1], 0)
+    
+    def test_pathStrategy_notGenerated(self):
+        self.assertIsNone(self._grid.path_strategy)
+    
+    def test_pathStrategy_backtrack(self):
+        self._grid.generate_path(8, 5)
+        self.assertEqual(self._grid.path_strategy, PathStrategy.BACKTRACK)
+    
+    def test_pathStrategy_notPossible(self):
+        self._grid.generate_path(5, 8)
+        self.assertIsNone(self._grid.path_strategy)
+    
+    def test_generatePath_nodeBudgetExceeded_fallsBackToConstructive(self):
+        path = self._grid.generate_path(8, 5, node_budget=0)
+        self.assertEqual(8, len(path))
+        self.assertEqual(self._grid.path_strategy, PathStrategy.CONSTRUCTIVE)
+    
+    def test_generatePath_deadlinePassed_fallsBackToConstructive(self):
+        path = self._grid.generate_path(320, 200, deadline=time.monotonic() - 1)
+        self.assertEqual(320, len(path))
+        self.assertEqual(self._grid.path_strategy, PathStrategy.CONSTRUCTIVE)
+    
+    def test_generatePath_constructive_validPath(self):
+        for path_length in range(5, 18):
+            path = self._grid.generate_path(path_length, 5, node_budget=0)
+            ys = list(map(lambda coord: coord[1], path))
+
+            self.assertEqual(path_length, len(path))
+            self.assertEqual(ys.count(4), 1)
+            self.assertEqual(ys.count(0), 1)
+            self.assertEqual(path[-1][1], 0)
+            self.assertEqual(len(path), len(set(path)))
+            for previous, coord in zip(path, path[1:]):
+                self.assertEqual(abs(coord[0] - previous[0]) + abs(coord[1] - previous[1]), 1)
+    
+    def test_strategy_default(self):
+        self.assertEqual(self._grid.strategy, PathStrategy.BACKTRACK)
+    
+    def test_strategy_unknown(self):
+        with self.assertRaises(ValueError) as error:
+            MemoryMazeGrid("unknown")
+        self.assertEqual(str(error.exception), "Unknown path strategy")
+    
+    def test_generatePath_constructiveStrategy(self):
+        grid = MemoryMazeGrid(PathStrategy.CONSTRUCTIVE)
+        path = grid.generate_path(8, 5)
+        self.assertEqual(8, len(path))
+        self.assertEqual(grid.path_strategy, PathStrategy.CONSTRUCTIVE)
+    
+    def test_generatePath_uniformStrategy(self):
+        grid = MemoryMazeGrid(PathStrategy.UNIFORM)
+        path = grid.generate_path(8, 5)
+        self.assertEqual(8, len(path))
+        self.assertEqual(path[-1][1], 0)
+        self.assertEqual(grid.path_strategy, PathStrategy.UNIFORM)
+    
+    def test_generatePath_strategyOverridesDefault(self):
+        self._grid.generate_path(8, 5, strategy=PathStrategy.CONSTRUCTIVE)
+        self.assertEqual(self._grid.path_strategy, PathStrategy.CONSTRUCTIVE)
+    
+    def test_registerStrategy(self):
+        straight_up = lambda grid, path_length, grid_size, node_budget, deadline, rng: [(0, y) for y in range(grid_size - 1, -1, -1)]
+        MemoryMazeGrid.register_strategy("straight", straight_up)
+        try:
+            path = MemoryMazeGrid("straight").generate_path(5, 5)
+            self.assertEqual(path, [(0, 4), (0, 3), (0, 2), (0, 1), (0, 0)])
+        finally:
+            del MemoryMazeGrid._strategies["straight"]
+    
+    def test_pathHash(self):
+        path = [(1, 4), (1, 3), (2, 3), (2, 2), (2, 1), (2, 0)]
+        other = [(1, 4), (1, 3), (1, 2), (2, 2), (2, 1), (2, 0)]
+
+        self.assertEqual(path_hash(path, 5), path_hash(list(path), 5))
+        self.assertNotEqual(path_hash(path, 5), path_hash(other, 5))
+        self.assertNotEqual(path_hash(path, 5), path_hash(path, 6))
+    
+    def test_generatePath_seenPath_rerolled(self):
+        first = [(0, 4), (0, 3), (0, 2), (0, 1), (0, 0)]
+        second = [(1, 4), (1, 3), (1, 2), (1, 1), (1, 0)]
+        paths = [first, second]
+        MemoryMazeGrid.register_strategy("fixed", lambda grid, *args: paths.pop(0))
+        seen_paths = SeenPaths()
+        seen_paths.add(path_hash(first, 5))
+        try:
+            path = MemoryMazeGrid("fixed", seen_paths=seen_paths).generate_path(5, 5)
+            self.assertEqual(path, second)
+            self.assertIn(path_hash(second, 5), seen_paths)
+        finally:
+            del MemoryMazeGrid._strategies["fixed"]
+    
+    def test_createPath_notRemembered(self):
+        seen_paths = SeenPaths()
+        grid = MemoryMazeGrid(seen_paths=seen_paths)
+        path, _ = grid.create_path(8, 5)
+
+        self.assertEqual(len(seen_paths), 0)
+
+        grid.set_path(path, 5)
+        self.assertIn(path_hash(path, 5), seen_paths)
+    
+    def test_generatePath_allSeen_keepsLastPath(self):
+        calls = []
+        path = [(0, 4), (0, 3), (0, 2), (0, 1), (0, 0)]
+        MemoryMazeGrid.register_strategy("fixed", lambda grid, *args: calls.append(1) or path)
+        seen_paths = SeenPaths()
+        seen_paths.add(path_hash(path, 5))
+        try:
+            self.assertEqual(MemoryMazeGrid("fixed", seen_paths=seen_paths).generate_path(5, 5), path)
+            self.assertEqual(len(calls), MAX_REROLLS + 1)
+        finally:
+            del MemoryMazeGrid._strategies["fixed"]
+    
+    def test_generatePath_seenPathsWithSeed_notRerolled(self):
+        seen_paths = SeenPaths()
+        path = MemoryMazeGrid(seed=1).generate_path(8, 5)
+        seen_paths.add(path_hash(path, 5))
+
+        self.assertEqual(MemoryMazeGrid(seed=1, seen_paths=seen_paths).generate_path(8, 5), path)
+    
+    def test_generatePath_sameSeed_samePath(self):
+        for strategy in (PathStrategy.BACKTRACK, PathStrategy.CONSTRUCTIVE, PathStrategy.UNIFORM):
+            path = MemoryMazeGrid(strategy, seed=42).generate_path(16, 10)
+            self.assertEqual(MemoryMazeGrid(strategy, seed=42).generate_path(16, 10), path)
+    
+    def test_generatePath_differentSeeds_differentPaths(self):
+        paths = set(tuple(MemoryMazeGrid(seed=seed).generate_path(16, 10)) for seed in range(10))
+        self.assertGreater(len(paths), 1)
+    
+    def test_generatePath_injectedRng(self):
+        path = MemoryMazeGrid(rng=random.Random(7)).generate_path(16, 10)
+        self.assertEqual(MemoryMazeGrid(rng=random.Random(7)).generate_path(16, 10), path)
+    
+    def test_generatePath_seedWithCache_usesCachedPath(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = PathCache(os.path.join(cache_dir, "paths.json"))
+            path = [(0, 4), (0, 3), (0, 2), (0, 1), (0, 0)]
+            cache.put(42, PathStrategy.BACKTRACK, 5, 5, path, PathStrategy.BACKTRACK)
+
+            grid = MemoryMazeGrid(seed=42, cache=cache)
+            self.assertEqual(grid.generate_path(5, 5), path)
+            
+            # Paths not in the cache are added
+            path = grid.generate_path(8, 5)
+            self.assertEqual(cache.get(42, PathStrategy.BACKTRACK, 5, 8), (path, PathStrategy.BACKTRACK))
+    
     def test_generatePath_negativePathLength_returnsNone(self):
         with self.assertRaises(ValueError) as error:
             self._grid.generate_path(-1, 8)
@@ -261,6 +498,27 @@ class TestGrid(unittest.TestCase):
 
         self.assertIsNone(result)
     
+    def test_select_afterIncorrect_allowsSelectingPathAgain(self):
+        path = self._grid.generate_path(8, 5)
+
+        self._grid.select(*path[0])
+        self._grid.select(*path[1])
+        x, y = path[1]
+        wrong = next(square for square in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
+            if square != path[2] and square != path[0] and 0 <= square[0] < 5 and square[1] < 5)
+        self.assertEqual(self._grid.select(*wrong), SelectResult.INCORRECT)
+
+        self.assertEqual(self._grid.select(*path[0]), SelectResult.CORRECT)
+        self.assertEqual(self._grid.select(*path[1]), SelectResult.CORRECT)
+    
+    def test_select_longPath(self):
+        path = self._grid.generate_path(9802, 100, strategy=PathStrategy.CONSTRUCTIVE)
+
+        for square in path[:-1]:
+            self.assertEqual(self._grid.select(*square), SelectResult.CORRECT)
+            self.assertIsNone(self._grid.select(*path[0]))
+        self.assertEqual(self._grid.select(*path[-1]), SelectResult.COMPLETE)
+    
     def test_select_doesNotAllowSelectingOutOfBounds_bottom(self):
         path = self._grid.generate_path(8, 5)
 
@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+
+from memorymaze import MemoryMaze
+from memorymaze.gamestate import GameState
+from memorymaze.levelpack import LevelPack
+from memorymaze.levelpack import build_level_pack
+from memorymaze.levelpack import main
+
+
+class TestLevelPack(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._file = os.path.join(self._dir.name, "levels.mmlp")
+    
+    def tearDown(self):
+        self._dir.cleanup()
+    
+    def test_build(self):
+        build_level_pack(self._file, 5, seed=1)
+        game_state = GameState()
+
+        with LevelPack(self._file) as pack:
+            self.assertEqual(len(pack), 5)
+
+            for level in range(1, 6):
+                grid_size, path = pack.level(level)
+                self.assertEqual(grid_size, game_state.grid_size_at(level))
+                self.assertEqual(len(path), game_state.path_size_at(level))
+                self.assertEqual(len(set(path)), len(path))
+                self.assertEqual(path[0][1], grid_size - 1)
+                self.assertEqual(path[-1][1], 0)
+    
+    def test_build_seeded(self):
+        other = os.path.join(self._dir.name, "other.mmlp")
+        build_level_pack(self._file, 3, seed=1)
+        build_level_pack(other, 3, seed=1)
+
+        with open(self._file, "rb") as f, open(other, "rb") as g:
+            self.assertEqual(f.read(), g.read())
+    
+    def test_build_noLevels(self):
+        with self.assertRaises(ValueError):
+            build_level_pack(self._file, 0)
+    
+    def test_level_outOfRange(self):
+        build_level_pack(self._file, 2)
+
+        with LevelPack(self._file) as pack:
+            self.assertIsNone(pack.level(0))
+            self.assertIsNone(pack.level(3))
+    
+    def test_level_truncated(self):
+        build_level_pack(self._file, 2, seed=1)
+        with open(self._file, "r+b") as f:
+            f.truncate(f.seek(0, 2) - 1)
+
+        with LevelPack(self._file) as pack:
+            self.assertIsNotNone(pack.level(1))
+            with self.assertRaises(ValueError):
+                pack.level(2)
+    
+    def test_level_squareOutsideGrid(self):
+        build_level_pack(self._file, 2, seed=1)
+        with open(self._file, "r+b") as f:
+            # First square of level 1, after the header and two index entries
+            f.seek(24)
+            f.write(b"\xff\xff")
+
+        with LevelPack(self._file) as pack:
+            with self.assertRaises(ValueError):
+                pack.level(1)
+    
+    def test_open_notLevelPack(self):
+        with open(self._file, "wb") as f:
+            f.write(b"not a level pack")
+
+        with self.assertRaises(ValueError):
+            LevelPack(self._file)
+    
+    def test_open_empty(self):
+        open(self._file, "wb").close()
+
+        with self.assertRaises(ValueError):
+            LevelPack(self._file)
+    
+    def test_main(self):
+        main([self._file, "2", "--strategy", "constructive", "--seed", "1"])
+
+        with LevelPack(self._file) as pack:
+            self.assertEqual(len(pack), 2)
+    
+    def test_memoryMaze(self):
+        build_level_pack(self._file, 2, seed=1)
+
+        with LevelPack(self._file) as pack:
+            memory_maze = MemoryMaze(prefetch=False, level_pack=pack)
+            self.assertEqual(memory_maze.grid.path, pack.level(1)[1])
+            self.assertIsNone(memory_maze.grid.path_strategy)
+
+            memory_maze.next_level()
+            self.assertEqual(memory_maze.grid.path, pack.level(2)[1])
+
+            # Past the end of the pack, paths are generated
+            memory_maze.next_level()
+            self.assertEqual(len(memory_maze.grid.path), memory_maze.game_state.path_size)
+            self.assertIsNotNone(memory_maze.grid.path_strategy)
+    
+    def test_memoryMaze_corrupt_generatesPath(self):
+        build_level_pack(self._file, 2, seed=1)
+        with open(self._file, "r+b") as f:
+            f.seek(24)
+            f.write(b"\xff\xff")
+
+        with LevelPack(self._file) as pack:
+            memory_maze = MemoryMaze(prefetch=False, level_pack=pack)
+            self.assertEqual(len(memory_maze.grid.path), GameState().path_size_at(1))
+            self.assertIsNotNone(memory_maze.grid.path_strategy)
@@ -1,9 +1,15 @@
 import unittest
 
 from memorymaze import MemoryMaze
+from memorymaze.change import Change
+from memorymaze.change import ChangeType
 from memorymaze.gamestate import START_GRID_SIZE
 from memorymaze.gamestate import STARTING_LIVES
+from memorymaze.grid import path_hash
+from memorymaze.result import NO_RESULT
 from memorymaze.result import SelectResult
+from memorymaze.seen import SeenPaths
+from memorymaze.strategy import PathStrategy
 
 
 class TestMemoryMaze(unittest.TestCase):
@@ -17,6 +23,15 @@ class TestMemoryMaze(unittest.TestCase):
     def test_grid(self):
         self.assertIsNotNone(self._memory_maze.grid)
     
+    def test_noInstanceDict(self):
+        self.assertFalse(hasattr(self._memory_maze, "__dict__"))
+        self.assertFalse(hasattr(self._memory_maze.grid, "__dict__"))
+        self.assertFalse(hasattr(self._memory_maze.game_state, "__dict__"))
+    
+    def test_strategy(self):
+        memory_maze = MemoryMaze(PathStrategy.CONSTRUCTIVE)
+        self.assertEqual(memory_maze.grid.path_strategy, PathStrategy.CONSTRUCTIVE)
+    
     def test_select(self):
         result = self._memory_maze.select(*self._memory_maze.grid.path[0])
         self.assertEqual(result, SelectResult.CORRECT)
@@ -34,6 +49,180 @@ class TestMemoryMaze(unittest.TestCase):
         result = self._memory_maze.select(*guess)
         self.assertEqual(result, SelectResult.GAME_OVER)
     
+    def test_selectMany_complete(self):
+        path = list(self._memory_maze.grid.path)
+
+        # Moves after completing the level are not applied
+        results = self._memory_maze.select_many(path + path)
+
+        self.assertEqual(list(results), [SelectResult.CORRECT.value] * (len(path) - 1)
+            + [SelectResult.COMPLETE.value])
+        self.assertEqual(self._memory_maze.game_state.level, 2)
+        self.assertIsNone(self._memory_maze.grid.last_position)
+    
+    def test_selectMany_gameOver(self):
+        guess = (0, START_GRID_SIZE - 1)
+        if guess == self._memory_maze.grid.path[0]:
+            guess = (1, START_GRID_SIZE - 1)
+
+        results = self._memory_maze.select_many([guess] * (STARTING_LIVES + 2))
+
+        self.assertEqual(list(results), [SelectResult.INCORRECT.value] * (STARTING_LIVES - 1)
+            + [SelectResult.GAME_OVER.value])
+        self.assertEqual(self._memory_maze.game_state.lives, 0)
+    
+    def test_selectMany_locked(self):
+        self._memory_maze.lock()
+
+        results = self._memory_maze.select_many(self._memory_maze.grid.path)
+
+        self.assertEqual(list(results), [NO_RESULT] * self._memory_maze.game_state.path_size)
+        self.assertIsNone(self._memory_maze.grid.last_position)
+    
+    def test_selectMany_sameAsSelect(self):
+        memory_maze = MemoryMaze(prefetch=False, seed=1)
+        other = MemoryMaze(prefetch=False, seed=1)
+        path = list(memory_maze.grid.path)
+        moves = [path[0], (0, 0), path[1], path[0], (path[1][0], path[1][1] + 1)] + path
+
+        expected = []
+        for move in moves:
+            result = other.select(*move)
+            expected.append(NO_RESULT if result is None else result.value)
+            if result in (SelectResult.COMPLETE, SelectResult.GAME_OVER):
+                break
+
+        self.assertEqual(list(memory_maze.select_many(moves)), expected)
+        self.assertEqual(memory_maze.game_state.level, other.game_state.level)
+        self.assertEqual(memory_maze.game_state.lives, other.game_state.lives)
+        self.assertEqual(memory_maze.grid.last_position, other.grid.last_position)
+    
+    def test_toBytes_roundTrip(self):
+        self._memory_maze.next_level()
+        self._memory_maze.game_state.lose_life()
+        path = self._memory_maze.grid.path
+        self._memory_maze.select(*path[0])
+        self._memory_maze.select(*path[1])
+        self._memory_maze.lock()
+
+        data = self._memory_maze.to_bytes()
+        memory_maze = MemoryMaze.from_bytes(data, prefetch=False)
+
+        self.assertLess(len(data), 48)
+        self.assertEqual(memory_maze.game_state.level, 2)
+        self.assertEqual(memory_maze.game_state.lives, STARTING_LIVES - 1)
+        self.assertEqual(memory_maze.grid.path, path)
+        self.assertEqual(memory_maze.grid.last_position, path[1])
+        self.assertIsNone(memory_maze.select(*path[2]))
+
+        memory_maze.unlock()
+        self.assertEqual(memory_maze.select(*path[2]), SelectResult.CORRECT)
+    
+    def test_fromBytes_prefetchesNextLevel(self):
+        memory_maze = MemoryMaze.from_bytes(self._memory_maze.to_bytes())
+        path = list(memory_maze.grid.path)
+
+        memory_maze.select_many(path)
+
+        self.assertEqual(memory_maze.game_state.level, 2)
+        self.assertEqual(len(memory_maze.grid.path), memory_maze.game_state.path_size)
+    
+    def test_fromBytes_unsupportedVersion(self):
+        data = bytearray(self._memory_maze.to_bytes())
+        data[0] = 0
+
+        with self.assertRaises(ValueError):
+            MemoryMaze.from_bytes(bytes(data))
+    
+    def test_fromBytes_truncated(self):
+        with self.assertRaises(ValueError):
+            MemoryMaze.from_bytes(self._memory_maze.to_bytes()[:4])
+    
+    def test_fromBytes_currentIndexOutsidePath(self):
+        data = bytearray(self._memory_maze.to_bytes())
+        data[10] = 255
+
+        with self.assertRaises(ValueError):
+            MemoryMaze.from_bytes(bytes(data))
+    
+    def test_fromBytes_gridSizeDoesNotMatchLevel(self):
+        data = bytearray(self._memory_maze.to_bytes())
+        data[8] += 1
+
+        with self.assertRaises(ValueError):
+            MemoryMaze.from_bytes(bytes(data))
+    
+    def test_subscribe_correct(self):
+        changes = []
+        self._memory_maze.subscribe(changes.append)
+        path = self._memory_maze.grid.path
+
+        self._memory_maze.select(*path[0])
+
+        self.assertEqual(changes, [[Change(ChangeType.TILE_CORRECT, path[0])]])
+    
+    def test_subscribe_complete(self):
+        changes = []
+        self._memory_maze.subscribe(changes.append)
+        path = list(self._memory_maze.grid.path)
+
+        for square in path:
+            self._memory_maze.select(*square)
+
+        self.assertEqual(changes[-1], [Change(ChangeType.TILE_CORRECT, path[-1]),
+            Change(ChangeType.LEVEL_CHANGED, value=2), Change(ChangeType.PATH_READY)])
+    
+    def test_subscribe_incorrect(self):
+        changes = []
+        self._memory_maze.subscribe(changes.append)
+        guess = (0, START_GRID_SIZE - 1)
+        if guess == self._memory_maze.grid.path[0]:
+            guess = (1, START_GRID_SIZE - 1)
+
+        self._memory_maze.select(*guess)
+
+        self.assertEqual(changes, [[Change(ChangeType.TILE_INCORRECT, guess), Change(ChangeType.SELECTION_RESET),
+            Change(ChangeType.LIVES_CHANGED, value=STARTING_LIVES - 1)]])
+    
+    def test_subscribe_ignoredSelect(self):
+        changes = []
+        self._memory_maze.subscribe(changes.append)
+
+        self._memory_maze.select(0, 0)
+        self._memory_maze.lock()
+        self._memory_maze.select(*self._memory_maze.grid.path[0])
+
+        self.assertEqual(changes, [])
+    
+    def test_subscribe_selectMany(self):
+        changes = []
+        self._memory_maze.subscribe(changes.append)
+        path = self._memory_maze.grid.path
+
+        self._memory_maze.select_many(path[:2])
+
+        self.assertEqual(changes, [[Change(ChangeType.TILE_CORRECT, path[0]),
+            Change(ChangeType.TILE_CORRECT, path[1])]])
+    
+    def test_subscribe_reset(self):
+        changes = []
+        self._memory_maze.next_level()
+        self._memory_maze.subscribe(changes.append)
+
+        self._memory_maze.reset()
+
+        self.assertEqual(changes, [[Change(ChangeType.LEVEL_CHANGED, value=1),
+            Change(ChangeType.LIVES_CHANGED, value=STARTING_LIVES), Change(ChangeType.PATH_READY)]])
+    
+    def test_unsubscribe(self):
+        changes = []
+        self._memory_maze.subscribe(changes.append)
+        self._memory_maze.unsubscribe(changes.append)
+
+        self._memory_maze.next_level()
+
+        self.assertEqual(changes, [])
+    
     def test_nextLevel(self):
         self._memory_maze.next_level()
         self.assertEqual(self._memory_maze.game_state.level, 2)
@@ -53,6 +242,57 @@ class TestMemoryMaze(unittest.TestCase):
         self.assertEqual(self._memory_maze.game_state.level, 1)
         self.assertEqual(self._memory_maze.game_state.lives, STARTING_LIVES)
     
+    def test_nextLevel_usesPrefetchedPath(self):
+        path, _ = self._memory_maze._prefetch.result()
+        self._memory_maze.next_level()
+        self.assertEqual(self._memory_maze.grid.path, path)
+    
+    def test_select_complete_usesPrefetchedPath(self):
+        path, _ = self._memory_maze._prefetch.result()
+        for coord in self._memory_maze.grid.path:
+            result = self._memory_maze.select(*coord)
+        
+        self.assertEqual(result, SelectResult.COMPLETE)
+        self.assertEqual(self._memory_maze.grid.path, path)
+    
+    def test_reset_discardsPrefetchedPath(self):
+        self._memory_maze.next_level()
+        self._memory_maze.reset()
+
+        self.assertEqual(self._memory_maze._prefetch_level, 2)
+        self.assertEqual(len(self._memory_maze.grid.path), self._memory_maze.game_state.path_size)
+        self.assertEqual(self._memory_maze.grid.path[0][1], START_GRID_SIZE - 1)
+    
+    def test_prefetchDisabled(self):
+        memory_maze = MemoryMaze(prefetch=False)
+        memory_maze.next_level()
+
+        self.assertIsNone(memory_maze._prefetch)
+        self.assertEqual(len(memory_maze.grid.path), memory_maze.game_state.path_size)
+    
+    def test_seenPaths_onlyPathsSet(self):
+        seen_paths = SeenPaths()
+        memory_maze = MemoryMaze(seen_paths=seen_paths)
+        first = memory_maze.grid.path
+        prefetched, _ = memory_maze._prefetch.result()
+
+        self.assertEqual(len(seen_paths), 1)
+        self.assertIn(path_hash(first, memory_maze.game_state.grid_size), seen_paths)
+
+        memory_maze.next_level()
+        self.assertEqual(memory_maze.grid.path, prefetched)
+        self.assertEqual(len(seen_paths), 2)
+        self.assertIn(path_hash(prefetched, memory_maze.game_state.grid_size), seen_paths)
+    
+    def test_seed(self):
+        memory_maze = MemoryMaze(seed=123)
+        other = MemoryMaze(seed=123)
+        self.assertEqual(memory_maze.grid.path, other.grid.path)
+
+        memory_maze.next_level()
+        other.next_level()
+        self.assertEqual(memory_maze.grid.path, other.grid.path)
+    
     def test_lock(self):
         self._memory_maze.lock()
 
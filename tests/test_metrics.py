@@ -0,0 +1,83 @@
+import importlib.util
+import unittest
+
+from memorymaze.metrics import analyze
+from memorymaze.metrics import generate_paths
+from memorymaze.metrics import pack_paths
+from memorymaze.metrics import path_metrics
+from memorymaze.metrics import summarize
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+@unittest.skipUnless(HAS_NUMPY, "NumPy is not installed")
+class TestMetrics(unittest.TestCase):
+
+    def test_packPaths(self):
+        squares = pack_paths([[(0, 2), (1, 2), (1, 1)], [(2, 2), (2, 1), (2, 0)]], 3)
+
+        self.assertEqual(squares.tolist(), [[6, 7, 4], [8, 5, 2]])
+    
+    def test_packPaths_differentLengths(self):
+        with self.assertRaises(ValueError):
+            pack_paths([[(0, 2)], [(0, 2), (0, 1)]], 3)
+    
+    def test_pathMetrics(self):
+        # Right, right, up, left, up, up, then left, left, left, up, up, up on
+        # a 4x4 grid
+        first = [(0, 3), (1, 3), (2, 3), (2, 2), (1, 2), (1, 1), (1, 0)]
+        second = [(3, 3), (2, 3), (1, 3), (0, 3), (0, 2), (0, 1), (0, 0)]
+        metrics = path_metrics(pack_paths([first, second], 4), 4)
+
+        self.assertEqual(metrics["turns"].tolist(), [3, 1])
+        self.assertEqual(metrics["down_moves"].tolist(), [0, 0])
+        self.assertEqual(metrics["horizontal_runs"].tolist(), [2, 1])
+        self.assertEqual(metrics["max_horizontal_run"].tolist(), [2, 3])
+        self.assertEqual(metrics["mean_horizontal_run"].tolist(), [1.5, 3])
+        self.assertEqual(metrics["width"].tolist(), [3, 4])
+        self.assertEqual(metrics["height"].tolist(), [4, 4])
+    
+    def test_pathMetrics_downMoves(self):
+        # Up, up, right, down, down, right, up, up, up on a 4x4 grid
+        path = [(0, 3), (0, 2), (0, 1), (1, 1), (1, 2), (1, 3), (2, 3), (2, 2), (2, 1), (2, 0)]
+        metrics = path_metrics(pack_paths([path], 4), 4)
+
+        self.assertEqual(metrics["down_moves"].tolist(), [2])
+        self.assertEqual(metrics["turns"].tolist(), [4])
+        self.assertEqual(metrics["horizontal_runs"].tolist(), [2])
+    
+    def test_pathMetrics_not2D(self):
+        with self.assertRaises(ValueError):
+            path_metrics([0, 1, 2], 3)
+    
+    def test_generatePaths(self):
+        squares = generate_paths(10, 6, 50, seed=1)
+
+        self.assertEqual(squares.shape, (50, 10))
+        self.assertTrue((squares // 6 == 5).any(axis=1).all())
+        self.assertEqual(squares.tolist(), generate_paths(10, 6, 50, seed=1).tolist())
+    
+    def test_generatePaths_notPossible(self):
+        with self.assertRaises(ValueError):
+            generate_paths(1000, 5, 1)
+    
+    def test_summarize(self):
+        summary = summarize(path_metrics(generate_paths(10, 6, 100, seed=1), 6))
+
+        self.assertEqual(summary["height"]["min"], 6)
+        self.assertLessEqual(summary["turns"]["p10"], summary["turns"]["p50"])
+        self.assertLessEqual(summary["turns"]["p50"], summary["turns"]["p90"])
+    
+    def test_analyze(self):
+        results = analyze(2, samples=20, seed=1)
+
+        self.assertEqual(set(results), {1, 2})
+        self.assertEqual(results[2]["height"]["mean"], 6)
+
+
+@unittest.skipIf(HAS_NUMPY, "NumPy is installed")
+class TestMetricsWithoutNumpy(unittest.TestCase):
+
+    def test_pathMetrics_noNumpy(self):
+        with self.assertRaisesRegex(ImportError, "pip install numpy"):
+            path_metrics([[0, 1]], 2)
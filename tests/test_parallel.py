@@ -0,0 +1,43 @@
+import unittest
+
+from memorymaze.grid import MemoryMazeGrid
+from memorymaze.parallel import race_path
+from memorymaze.strategy import PathStrategy
+
+
+class TestParallel(unittest.TestCase):
+
+    def test_racePath(self):
+        path = race_path(16, 10, 2)
+        ys = list(map(lambda coord: coord[1], path))
+
+        self.assertEqual(16, len(path))
+        self.assertEqual(ys.count(9), 1)
+        self.assertEqual(ys.count(0), 1)
+        self.assertEqual(path[-1][1], 0)
+        self.assertEqual(len(path), len(set(path)))
+    
+    def test_racePath_notPossible_returnsNone(self):
+        self.assertIsNone(race_path(5, 8, 2))
+    
+    def test_racePath_zeroGridSize(self):
+        with self.assertRaises(ValueError) as error:
+            race_path(5, 0, 2)
+        self.assertEqual(str(error.exception), "Grid size must be positive")
+    
+    def test_generatePath_parallelStrategy(self):
+        grid = MemoryMazeGrid(PathStrategy.PARALLEL, parallel_attempts=2)
+        path = grid.generate_path(8, 5)
+        self.assertEqual(8, len(path))
+        self.assertEqual(grid.path_strategy, PathStrategy.PARALLEL)
+    
+    def test_generatePath_parallelStrategy_budgetExceeded_fallsBackToConstructive(self):
+        grid = MemoryMazeGrid(PathStrategy.PARALLEL, parallel_attempts=2)
+        path = grid.generate_path(16, 10, node_budget=0)
+        self.assertEqual(16, len(path))
+        self.assertEqual(grid.path_strategy, PathStrategy.CONSTRUCTIVE)
+    
+    def test_parallelAttempts_zero(self):
+        with self.assertRaises(ValueError) as error:
+            MemoryMazeGrid(PathStrategy.PARALLEL, parallel_attempts=0)
+        self.assertEqual(str(error.exception), "Parallel attempts must be positive")
@@ -0,0 +1,109 @@
+import os
+import random
+import tempfile
+import unittest
+
+from memorymaze import sampler
+from memorymaze.sampler import PathCounts
+from memorymaze.sampler import path_counts
+
+
+def _all_paths(grid_size, path_length):
+    # Lists every path that never moves down, the slow way
+    paths = []
+
+    def extend(path):
+        x, y = path[-1]
+        if len(path) == path_length:
+            if y == 0:
+                paths.append(tuple(path))
+            return
+        if y == 0:
+            return
+        options = [(x, y - 1)]
+        if 0 < y < grid_size - 1:
+            options += [(x - 1, y), (x + 1, y)]
+        for option in options:
+            if 0 <= option[0] < grid_size and option not in path:
+                extend(path + [option])
+
+    for x in range(grid_size):
+        extend([(x, grid_size - 1)])
+
+    return paths
+
+
+class TestSampler(unittest.TestCase):
+
+    def test_total_matchesEnumeration(self):
+        for grid_size in range(1, 6):
+            for path_length in range(1, grid_size * grid_size + 1):
+                counts = PathCounts(grid_size, path_length)
+                self.assertEqual(counts.total, len(_all_paths(grid_size, path_length)))
+    
+    def test_sample_validPath(self):
+        path = PathCounts(5, 8).sample()
+        ys = list(map(lambda coord: coord[1], path))
+
+        self.assertEqual(8, len(path))
+        self.assertEqual(ys.count(4), 1)
+        self.assertEqual(ys.count(0), 1)
+        self.assertEqual(path[-1][1], 0)
+        self.assertEqual(len(path), len(set(path)))
+        for previous, coord in zip(path, path[1:]):
+            self.assertEqual(abs(coord[0] - previous[0]) + abs(coord[1] - previous[1]), 1)
+    
+    def test_sample_notPossible_returnsNone(self):
+        self.assertIsNone(PathCounts(8, 5).sample())
+    
+    def test_sample_uniform(self):
+        paths = _all_paths(4, 7)
+        counts = PathCounts(4, 7)
+        rng = random.Random(0)
+
+        samples = {}
+        for _ in range(len(paths) * 200):
+            path = tuple(counts.sample(rng))
+            samples[path] = samples.get(path, 0) + 1
+        
+        # Every path is drawn, and none much more often than the others
+        self.assertEqual(set(samples), set(paths))
+        self.assertLess(max(samples.values()), 1.5 * min(samples.values()))
+    
+    def test_sample_sameSeed_samePath(self):
+        counts = PathCounts(10, 16)
+        self.assertEqual(counts.sample(random.Random(1)), counts.sample(random.Random(1)))
+    
+    def test_zeroPathLength(self):
+        with self.assertRaises(ValueError) as error:
+            PathCounts(5, 0)
+        self.assertEqual(str(error.exception), "Path length must be positive")
+    
+    def test_pathCounts_cachedInMemory(self):
+        self.assertIs(path_counts(6, 10), path_counts(6, 10))
+    
+    def test_pathCounts_cachedOnDisk(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            sampler._CACHE.pop((7, 11), None)
+            counts = path_counts(7, 11, cache_dir)
+            self.assertTrue(os.path.exists(os.path.join(cache_dir, "counts-7-11.json")))
+
+            sampler._CACHE.pop((7, 11))
+            loaded = path_counts(7, 11, cache_dir)
+            self.assertIsNot(loaded, counts)
+            self.assertEqual(loaded.total, counts.total)
+            self.assertEqual(loaded.sample(random.Random(2)), counts.sample(random.Random(2)))
+    
+    def test_pathCounts_truncatedOnDisk_rebuilt(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            file = os.path.join(cache_dir, "counts-7-12.json")
+            with open(file, "w") as f:
+                f.write('{"version": 1, "gridSi')
+
+            sampler._CACHE.pop((7, 12), None)
+            counts = path_counts(7, 12, cache_dir)
+            self.assertEqual(counts.total, PathCounts(7, 12).total)
+            self.assertEqual(os.listdir(cache_dir), ["counts-7-12.json"])
+
+            sampler._CACHE.pop((7, 12))
+            self.assertEqual(path_counts(7, 12, cache_dir).total, counts.total)
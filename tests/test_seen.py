@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from memorymaze.seen import SeenPaths
+
+
+class TestSeenPaths(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._file = os.path.join(self._dir.name, "seen.dat")
+    
+    def tearDown(self):
+        self._dir.cleanup()
+    
+    def test_add(self):
+        seen_paths = SeenPaths()
+
+        self.assertTrue(seen_paths.add(1))
+        self.assertFalse(seen_paths.add(1))
+        self.assertIn(1, seen_paths)
+        self.assertNotIn(2, seen_paths)
+    
+    def test_add_forgetsOldest(self):
+        seen_paths = SeenPaths(capacity=2)
+        seen_paths.add(1)
+        seen_paths.add(2)
+        seen_paths.add(3)
+
+        self.assertEqual(len(seen_paths), 2)
+        self.assertNotIn(1, seen_paths)
+        self.assertIn(3, seen_paths)
+    
+    def test_zeroCapacity(self):
+        with self.assertRaises(ValueError):
+            SeenPaths(capacity=0)
+    
+    def test_write(self):
+        seen_paths = SeenPaths(file=self._file)
+        seen_paths.add(1)
+        seen_paths.add(2 ** 64 - 1)
+        seen_paths.write()
+
+        seen_paths = SeenPaths(file=self._file)
+        self.assertEqual(len(seen_paths), 2)
+        self.assertIn(2 ** 64 - 1, seen_paths)
+    
+    def test_write_smallerCapacity_keepsNewest(self):
+        seen_paths = SeenPaths(file=self._file)
+        for path_hash in range(5):
+            seen_paths.add(path_hash)
+        seen_paths.write()
+
+        seen_paths = SeenPaths(capacity=2, file=self._file)
+        self.assertEqual(len(seen_paths), 2)
+        self.assertIn(4, seen_paths)
+        self.assertNotIn(2, seen_paths)
+    
+    def test_read_invalidFile(self):
+        with open(self._file, "wb") as f:
+            f.write(b"garbage")
+
+        self.assertEqual(len(SeenPaths(file=self._file)), 0)
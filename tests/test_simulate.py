@@ -0,0 +1,72 @@
+import random
+import unittest
+
+from memorymaze import MemoryMaze
+from memorymaze.simulate import ForgetfulPlayer
+from memorymaze.simulate import SimulationResult
+from memorymaze.simulate import run_games
+from memorymaze.simulate import simulate
+
+
+class TestSimulate(unittest.TestCase):
+
+    def test_forgetfulPlayer_neverForgets(self):
+        memory_maze = MemoryMaze(prefetch=False)
+        player = ForgetfulPlayer(0)
+
+        self.assertEqual(player.move(memory_maze, random.Random(1)), memory_maze.grid.path[0])
+    
+    def test_forgetfulPlayer_alwaysForgets(self):
+        memory_maze = MemoryMaze(prefetch=False)
+        player = ForgetfulPlayer(1)
+        path = memory_maze.grid.path
+        memory_maze.select(*path[0])
+
+        x, y = player.move(memory_maze, random.Random(1))
+        px, py = path[0]
+        self.assertNotEqual((x, y), path[1])
+        self.assertEqual(abs(x - px) + abs(y - py), 1)
+    
+    def test_forgetfulPlayer_invalidProbability(self):
+        with self.assertRaises(ValueError):
+            ForgetfulPlayer(1.5)
+    
+    def test_runGames_perfectPlayer(self):
+        result = run_games(3, ForgetfulPlayer(0), seed=1, max_level=4)
+
+        self.assertEqual(result.games, 3)
+        self.assertEqual(result.levels, {4: 3})
+        self.assertEqual(result.generations, 9)
+    
+    def test_runGames_hopelessPlayer(self):
+        result = run_games(3, ForgetfulPlayer(1), seed=1, starting_lives=2)
+
+        self.assertEqual(result.levels, {1: 3})
+        self.assertEqual(result.average_level, 1)
+        self.assertEqual(result.generations, 0)
+    
+    def test_simulationResult_merge(self):
+        result = SimulationResult({1: 2})
+        result.merge(SimulationResult({1: 1, 3: 1}, 0.5, 2))
+
+        self.assertEqual(result.levels, {1: 3, 3: 1})
+        self.assertEqual(result.average_level, 1.5)
+        self.assertEqual(result.generation_seconds, 0.5)
+    
+    def test_simulationResult_empty(self):
+        self.assertEqual(SimulationResult().average_level, 0)
+    
+    def test_simulate(self):
+        results = [result.games for result in simulate(5, ForgetfulPlayer(0.1), workers=2, chunk_size=2, seed=1,
+            max_level=5)]
+
+        self.assertEqual(results[-1], 5)
+        self.assertEqual(results, sorted(results))
+    
+    def test_runGames_impossiblePaths(self):
+        with self.assertRaises(ValueError):
+            run_games(1, ForgetfulPlayer(0), path_size_multiplier=0.5)
+    
+    def test_simulate_impossiblePaths(self):
+        with self.assertRaises(ValueError):
+            next(simulate(1, ForgetfulPlayer(0), workers=1, path_size_multiplier=0.5))